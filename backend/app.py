@@ -3,15 +3,32 @@ import os
 import uuid
 import json
 from datetime import datetime
+from werkzeug.exceptions import NotFound
 from werkzeug.utils import secure_filename
 import shutil
 import logging
+import threading
+import time
+import atexit
+from concurrent.futures import ThreadPoolExecutor, Future
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard library
+    orjson = None
 
 # Configuration constants
 class Config:
     MAX_CONTENT_LENGTH = 100 * 1024 * 1024  # 100MB
+    # Persistent Blender processes; requests run in threads, so this many sessions render in parallel.
+    # Defaults to half the CPU cores, capped at 4 since each worker is a full Blender process.
+    BLENDER_WORKERS = int(os.environ.get('BLENDER_WORKERS', min(4, max(1, (os.cpu_count() or 2) // 2))))
+    # Seconds a finished drawing job is kept for clients that have not collected its result
+    DRAW_JOB_TTL = 3600
+    # Model database changes within this many seconds are written to disk together
+    MODELS_SAVE_DELAY = 0.1
     ALLOWED_EXTENSIONS = {'obj', 'gltf', 'glb', 'fbx'}
     ALLOWED_TEXTURE_EXTENSIONS = {'jpg', 'jpeg', 'png', 'bmp', 'tga', 'tiff'}
     MIME_TYPES = {
@@ -33,16 +50,48 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 app.config['MAX_CONTENT_LENGTH'] = Config.MAX_CONTENT_LENGTH
 
+if orjson is not None:
+    from flask.json.provider import DefaultJSONProvider
+
+    class ORJSONProvider(DefaultJSONProvider):
+        """JSON provider that encodes jsonify() responses and parses request bodies with orjson"""
+
+        def dumps(self, obj, **kwargs):
+            try:
+                return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+            except TypeError:
+                # Types orjson does not know (e.g. Decimal) go through the default encoder
+                return super().dumps(obj, **kwargs)
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+    app.json = ORJSONProvider(app)
+
 MODELS_FOLDER = Path(app.root_path) / 'static' / 'models'
 TEXTURES_FOLDER = Path(app.root_path) / 'static' / 'textures'
 MODELS_DB_FILE = MODELS_FOLDER / 'models_db.json'
+MODELS_FOLDER_STR = str(MODELS_FOLDER)
 TEXTURES_DB_FILE = TEXTURES_FOLDER / 'textures_db.json'
+TEXTURES_FOLDER_STR = str(TEXTURES_FOLDER)
 
 MODELS_FOLDER.mkdir(parents=True, exist_ok=True)
 TEXTURES_FOLDER.mkdir(parents=True, exist_ok=True)
 
 models: List[Dict] = []
 textures: List[Dict] = []
+# Request threads finishing concurrently must not interleave database updates
+models_lock = threading.Lock()
+# Pending coalesced save of the models database, if any
+models_save_timer: Optional[threading.Timer] = None
+
+# Drawing sessions queued through /api/draw/jobs: job id -> Future of the new model entry.
+# One job thread per Blender worker; further jobs wait in the executor queue.
+draw_job_executor = ThreadPoolExecutor(max_workers=Config.BLENDER_WORKERS, thread_name_prefix="draw-job")
+draw_jobs: Dict[str, Future] = {}
+# job id -> time.monotonic() when it finished; uncollected jobs expire after Config.DRAW_JOB_TTL
+draw_jobs_finished: Dict[str, float] = {}
+draw_jobs_lock = threading.Lock()
 
 def is_allowed_file(filename: str, allowed_extensions: set) -> bool:
     """Check if file extension is allowed"""
@@ -52,10 +101,10 @@ def load_data_from_file(file_path: Path, data_type: str) -> List[Dict]:
     """Load data from JSON file with error handling"""
     try:
         if file_path.exists():
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                logger.info(f"Loaded {len(data)} {data_type} from database")
-                return data
+            raw = file_path.read_bytes()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            logger.info(f"Loaded {len(data)} {data_type} from database")
+            return data
         else:
             logger.info(f"No existing {data_type} database found")
             return []
@@ -66,14 +115,47 @@ def load_data_from_file(file_path: Path, data_type: str) -> List[Dict]:
 def save_data_to_file(data: List[Dict], file_path: Path, data_type: str) -> bool:
     """Save data to JSON file with error handling"""
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            file_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
         logger.info(f"Saved {len(data)} {data_type} to database")
         return True
     except Exception as e:
         logger.error(f"Error saving {data_type} database: {e}")
         return False
 
+def save_models() -> None:
+    """Write the models database; runs on the save timer and at exit"""
+    global models_save_timer
+    with models_lock:
+        models_save_timer = None
+        save_data_to_file(models, MODELS_DB_FILE, "models")
+
+def schedule_models_save() -> None:
+    """Save the models database shortly, unless a save is already pending. Call with models_lock held."""
+    global models_save_timer
+    if models_save_timer is None:
+        models_save_timer = threading.Timer(Config.MODELS_SAVE_DELAY, save_models)
+        models_save_timer.daemon = True
+        models_save_timer.start()
+
+def flush_models_save() -> None:
+    """Write a pending models database save immediately"""
+    timer = models_save_timer
+    if timer is not None:
+        timer.cancel()
+        save_models()
+
+atexit.register(flush_models_save)
+
+def add_model_entry(new_model: Dict) -> None:
+    """Append a model entry; the database file is written by the next scheduled save"""
+    with models_lock:
+        models.append(new_model)
+        schedule_models_save()
+
 def create_file_entry(filename: str, original_name: str, file_stats: os.stat_result, 
                      entry_type: str, request_data: Dict) -> Dict:
     """Create a standardized file entry"""
@@ -81,7 +163,7 @@ def create_file_entry(filename: str, original_name: str, file_stats: os.stat_res
     file_extension = Path(filename).suffix[1:].lower()
     
     base_entry = {
-        "id": str(uuid.uuid4()),
+        "id": uuid.uuid4().hex,
         "name": display_name,
         "description": request_data.get("description", f"Uploaded {entry_type}"),
         "format": file_extension,
@@ -123,7 +205,7 @@ def scan_and_add_existing_files(folder_path: Path, extensions: set,
                     
                     entry_type = "model" if url_key == "modelUrl" else "texture"
                     new_entry = {
-                        "id": str(uuid.uuid4()),
+                        "id": uuid.uuid4().hex,
                         "name": display_name,
                         "description": f"{entry_type.title()} loaded from file: {original_name}",
                         "format": file_path.suffix[1].lower(),
@@ -211,7 +293,7 @@ def initialize_storage() -> None:
 
 try:
     from blender_service import BlenderDrawingService
-    blender_service = BlenderDrawingService()
+    blender_service = BlenderDrawingService(max_workers=Config.BLENDER_WORKERS)
     logger.info("Blender service initialized successfully")
 except ImportError as e:
     logger.error(f"Failed to import BlenderDrawingService: {e}")
@@ -236,20 +318,18 @@ def serve_file_with_mime(folder: Path, filename: str) -> any:
         extension = Path(filename).suffix[1:].lower()
         mime_type = Config.MIME_TYPES.get(extension, 'application/octet-stream')
         
-        file_path = folder / filename
-        logger.info(f"Attempting to serve file: {file_path} (exists: {file_path.exists()})")
-        
-        response = make_response(send_from_directory(str(folder), filename))
-        response.headers['Content-Type'] = mime_type
+        # send_from_directory streams through the server's file wrapper (sendfile where
+        # available) and answers missing files with NotFound, so no separate stat is needed
+        response = make_response(send_from_directory(str(folder), filename, mimetype=mime_type))
         response.headers['Access-Control-Allow-Origin'] = '*'
         response.headers['Access-Control-Allow-Methods'] = 'GET, OPTIONS'
         response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
         return response
-    except FileNotFoundError:
+    except (FileNotFoundError, NotFound):
         logger.error(f"File not found when serving: {folder / filename}")
         return jsonify({"error": f"File {filename} not found"}), 404
     except Exception as e:
-        logger.error(f"Error serving file {filename}: {e}")
+        logger.exception("Error serving file %s: %s", filename, e)
         return jsonify({"error": "Internal server error"}), 500
 
 @app.route('/api/models', methods=['GET', 'OPTIONS'])
@@ -300,20 +380,19 @@ def upload_model():
             return jsonify({"error": f"File type not allowed. Supported: {', '.join(Config.ALLOWED_EXTENSIONS)}"}), 400
         
         filename = secure_filename(file.filename)
-        unique_filename = f"{uuid.uuid4()}_{filename}"
-        file_path = MODELS_FOLDER / unique_filename
+        unique_filename = f"{uuid.uuid4().hex}_{filename}"
+        file_path = os.path.join(MODELS_FOLDER_STR, unique_filename)
         
-        file.save(str(file_path))
-        file_stats = file_path.stat()
+        file.save(file_path)
+        file_stats = os.stat(file_path)
         
         new_model = create_file_entry(unique_filename, filename, file_stats, "model", request.form.to_dict())
-        models.append(new_model)
-        save_data_to_file(models, MODELS_DB_FILE, "models")
+        add_model_entry(new_model)
         
         return jsonify(new_model), 201
         
     except Exception as e:
-        logger.error(f"Upload error: {e}")
+        logger.exception("Upload error: %s", e)
         return jsonify({"error": "Upload failed"}), 500
 
 @app.route('/models/<path:filename>', methods=['GET', 'OPTIONS'])
@@ -323,12 +402,6 @@ def serve_model(filename):
         return _build_cors_preflight_response()
     
     logger.info(f"Serving model file: {filename}")
-    
-    file_path = MODELS_FOLDER / filename
-    if not file_path.exists():
-        logger.error(f"Model file not found: {file_path}")
-        return jsonify({"error": f"File {filename} not found"}), 404
-    
     return serve_file_with_mime(MODELS_FOLDER, filename)
 
 @app.route('/textures/<path:filename>', methods=['GET', 'OPTIONS'])
@@ -356,8 +429,9 @@ def delete_model(model_id):
     except Exception as e:
         logger.error(f"Error removing file: {e}")
     
-    models[:] = [m for m in models if m["id"] != model_id]
-    save_data_to_file(models, MODELS_DB_FILE, "models")  
+    with models_lock:
+        models[:] = [m for m in models if m["id"] != model_id]
+        schedule_models_save()
     
     return jsonify({"message": "Model deleted successfully"}), 200
 
@@ -387,11 +461,11 @@ def upload_texture():
         return jsonify({"error": f"File type not allowed. Supported: {', '.join(Config.ALLOWED_TEXTURE_EXTENSIONS)}"}), 400
     
     filename = secure_filename(file.filename)
-    unique_filename = f"{uuid.uuid4()}_{filename}"
-    file_path = TEXTURES_FOLDER / unique_filename
-    file.save(str(file_path))
+    unique_filename = f"{uuid.uuid4().hex}_{filename}"
+    file_path = os.path.join(TEXTURES_FOLDER_STR, unique_filename)
+    file.save(file_path)
     
-    file_stats = file_path.stat()
+    file_stats = os.stat(file_path)
     
     new_texture = create_file_entry(unique_filename, filename, file_stats, "texture", request.form.to_dict())
     textures.append(new_texture)
@@ -421,9 +495,20 @@ def delete_texture(texture_id):
     
     return jsonify({"message": "Texture deleted successfully"}), 200
 
+def move_generated_file(source, destination) -> None:
+    """
+    Put a generated file at its destination without copying its bytes when possible.
+    
+    On the same filesystem the file is renamed; anything else falls back to a regular copy.
+    """
+    try:
+        os.replace(source, destination)
+    except OSError:
+        shutil.copy2(source, destination)
+
 def cleanup_generated_files(output_path: str, dest_path: str):
     """
-    Clean up generated files and copy them to destination.
+    Clean up generated files and move them to destination.
     Removes orphaned MTL files and cleans OBJ references.
     
     Args:
@@ -431,7 +516,7 @@ def cleanup_generated_files(output_path: str, dest_path: str):
         dest_path: Destination file path
     """
     try:
-        shutil.copy2(output_path, dest_path)
+        move_generated_file(output_path, dest_path)
         
         if output_path.endswith('.obj'):
             source_mtl = output_path.replace('.obj', '.mtl')
@@ -443,19 +528,58 @@ def cleanup_generated_files(output_path: str, dest_path: str):
                         mtl_content = f.read().strip()
                     
                     if 'newmtl' in mtl_content and len(mtl_content.split('\n')) > 5:
-                        shutil.copy2(source_mtl, dest_mtl)
-                        logger.info(f"Copied MTL file: {dest_mtl}")
+                        move_generated_file(source_mtl, dest_mtl)
+                        logger.info(f"Moved MTL file: {dest_mtl}")
                     else:
                         logger.info(f"Skipped empty MTL file: {source_mtl}")
                 except Exception as e:
                     logger.warning(f"Error handling MTL file: {e}")
         
-        logger.info(f"Successfully copied files to: {dest_path}")
+        logger.info(f"Successfully moved files to: {dest_path}")
             
     except Exception as e:
         logger.error(f"Error in cleanup_generated_files: {e}")
         raise
 
+def register_generated_model(output_path: str, name: str, description: str, model_format: str = "obj") -> Dict:
+    """Move a Blender output into the models folder and add its database entry"""
+    filename = os.path.basename(output_path)
+    dest_path = os.path.join(MODELS_FOLDER_STR, filename)
+    cleanup_generated_files(output_path, dest_path)
+    
+    new_model = {
+        "id": uuid.uuid4().hex,
+        "name": name,
+        "description": description,
+        "modelUrl": f"/models/{filename}",
+        "format": model_format,
+        "category": "generated",
+        "fileSize": os.stat(dest_path).st_size,
+        "createdAt": datetime.now().isoformat(),
+        "isGenerated": True
+    }
+    
+    add_model_entry(new_model)
+    return new_model
+
+def register_session_model(session_data: Dict, output_path: str) -> Dict:
+    """Register the output of a drawing session as a generated model"""
+    new_model = register_generated_model(
+        output_path,
+        session_data.get("output_name", "Generated Model"),
+        "Generated using Blender drawing commands",
+        session_data.get("output_format", "obj")
+    )
+    logger.info(f"Successfully created drawing session model: {new_model}")
+    return new_model
+
+def run_drawing_job(session_data: Dict) -> Dict:
+    """Background job body: render the session and register the resulting model"""
+    success, output_path, error = blender_service.execute_drawing_session(session_data)
+    if not (success and output_path):
+        raise RuntimeError(error or "Unknown drawing error")
+    return register_session_model(session_data, output_path)
+
 @app.route('/api/draw/session', methods=['POST', 'OPTIONS'])
 def execute_drawing_session():
     """Execute a complete drawing session using Blender"""
@@ -470,34 +594,13 @@ def execute_drawing_session():
         if not session_data:
             return jsonify({"error": "No session data provided"}), 400
         
-        logger.info(f"Received drawing session request: {json.dumps(session_data, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Received drawing session request: {json.dumps(session_data, indent=2)}")
         
         success, output_path, error = blender_service.execute_drawing_session(session_data)
         
         if success and output_path:
-            # Copy the generated file to our models directory
-            filename = os.path.basename(output_path)
-            dest_path = MODELS_FOLDER / filename
-            cleanup_generated_files(output_path, dest_path)
-            
-            file_stats = dest_path.stat()
-            
-            new_model = {
-                "id": str(uuid.uuid4()),
-                "name": session_data.get("output_name", "Generated Model"),
-                "description": "Generated using Blender drawing commands",
-                "modelUrl": f"/models/{filename}",
-                "format": session_data.get("output_format", "obj"),
-                "category": "generated",
-                "fileSize": file_stats.st_size,
-                "createdAt": datetime.now().isoformat(),
-                "isGenerated": True
-            }
-            
-            models.append(new_model)
-            save_data_to_file(models, MODELS_DB_FILE, "models")
-            
-            logger.info(f"Successfully created drawing session model: {new_model}")
+            new_model = register_session_model(session_data, output_path)
             
             return jsonify({
                 "success": True,
@@ -512,12 +615,69 @@ def execute_drawing_session():
             }), 500
             
     except Exception as e:
-        logger.error(f"Exception in drawing session: {e}", exc_info=True)
+        logger.exception("Exception in drawing session: %s", e)
         return jsonify({
             "success": False,
             "error": f"Drawing session failed: {str(e)}"
         }), 500
 
+def mark_draw_job_finished(job_id: str) -> None:
+    """Start the expiry clock of a finished job that has not been collected yet"""
+    with draw_jobs_lock:
+        if job_id in draw_jobs:
+            draw_jobs_finished[job_id] = time.monotonic()
+
+def prune_draw_jobs() -> None:
+    """Forget finished jobs nobody collected within Config.DRAW_JOB_TTL. Call with draw_jobs_lock held."""
+    cutoff = time.monotonic() - Config.DRAW_JOB_TTL
+    for job_id in [job_id for job_id, finished_at in draw_jobs_finished.items() if finished_at < cutoff]:
+        del draw_jobs[job_id]
+        del draw_jobs_finished[job_id]
+
+@app.route('/api/draw/jobs', methods=['POST', 'OPTIONS'])
+def submit_drawing_job():
+    """Queue a drawing session and return its job id without waiting for Blender"""
+    if request.method == 'OPTIONS':
+        return _build_cors_preflight_response()
+    
+    if not blender_service:
+        return jsonify({"success": False, "error": "Blender service not available"}), 503
+    
+    session_data = request.get_json()
+    if not session_data:
+        return jsonify({"error": "No session data provided"}), 400
+    
+    job_id = uuid.uuid4().hex
+    with draw_jobs_lock:
+        prune_draw_jobs()
+        job = draw_jobs[job_id] = draw_job_executor.submit(run_drawing_job, session_data)
+    # Registered outside the lock: the callback takes it and runs inline if the job is already done
+    job.add_done_callback(lambda _: mark_draw_job_finished(job_id))
+    
+    return jsonify({"success": True, "job_id": job_id, "status": "pending"}), 202
+
+@app.route('/api/draw/jobs/<job_id>', methods=['GET', 'OPTIONS'])
+def get_drawing_job(job_id):
+    """Report a queued drawing session; finished jobs are forgotten once reported"""
+    if request.method == 'OPTIONS':
+        return _build_cors_preflight_response()
+    
+    with draw_jobs_lock:
+        prune_draw_jobs()
+        job = draw_jobs.get(job_id)
+        if job is None:
+            return jsonify({"error": "Job not found"}), 404
+        if not job.done():
+            return jsonify({"job_id": job_id, "status": "running" if job.running() else "pending"}), 200
+        del draw_jobs[job_id]
+        draw_jobs_finished.pop(job_id, None)
+    
+    error = job.exception()
+    if error is not None:
+        logger.error(f"Drawing job {job_id} failed: {error}")
+        return jsonify({"job_id": job_id, "status": "failed", "error": str(error)}), 200
+    return jsonify({"job_id": job_id, "status": "done", "model": job.result()}), 200
+
 @app.route('/api/draw/line', methods=['POST', 'OPTIONS'])
 def draw_line_endpoint():
     """Draw a simple line"""
@@ -540,32 +700,14 @@ def draw_line_endpoint():
         success, output_path, error = blender_service.create_line(points, color, thickness, name)
         
         if success and output_path:
-            filename = os.path.basename(output_path)
-            dest_path = MODELS_FOLDER / filename
-            cleanup_generated_files(output_path, dest_path)
-            
-            file_stats = dest_path.stat()
-            
-            new_model = {
-                "id": str(uuid.uuid4()),
-                "name": name,
-                "description": f"Line drawing with {len(points)} points",
-                "modelUrl": f"/models/{filename}",
-                "format": "obj",
-                "category": "generated",
-                "fileSize": file_stats.st_size,
-                "createdAt": datetime.now().isoformat(),
-                "isGenerated": True
-            }
-            
-            models.append(new_model)
-            save_data_to_file(models, MODELS_DB_FILE, "models")
+            new_model = register_generated_model(output_path, name, f"Line drawing with {len(points)} points")
             
             return jsonify({"success": True, "model": new_model}), 201
         else:
             return jsonify({"success": False, "error": error}), 500
             
     except Exception as e:
+        logger.exception("Exception in line drawing: %s", e)
         return jsonify({"success": False, "error": str(e)}), 500
 
 @app.route('/api/draw/primitive', methods=['POST', 'OPTIONS'])
@@ -592,26 +734,7 @@ def draw_primitive_endpoint():
         )
         
         if success and output_path:
-            filename = os.path.basename(output_path)
-            dest_path = MODELS_FOLDER / filename
-            cleanup_generated_files(output_path, dest_path)
-            
-            file_stats = dest_path.stat()
-            
-            new_model = {
-                "id": str(uuid.uuid4()),
-                "name": name,
-                "description": f"Generated {primitive_type}",
-                "modelUrl": f"/models/{filename}",
-                "format": "obj",
-                "category": "generated",
-                "fileSize": file_stats.st_size,
-                "createdAt": datetime.now().isoformat(),
-                "isGenerated": True
-            }
-            
-            models.append(new_model)
-            save_data_to_file(models, MODELS_DB_FILE, "models") 
+            new_model = register_generated_model(output_path, name, f"Generated {primitive_type}")
             logger.info(f"Successfully created primitive: {new_model}")
             return jsonify({"success": True, "model": new_model}), 201
         else:
@@ -619,7 +742,7 @@ def draw_primitive_endpoint():
             return jsonify({"success": False, "error": error}), 500
             
     except Exception as e:
-        logger.error(f"Exception in primitive drawing: {e}", exc_info=True)
+        logger.exception("Exception in primitive drawing: %s", e)
         return jsonify({"success": False, "error": str(e)}), 500
 
 @app.route('/api/draw/custom-coords', methods=['POST', 'OPTIONS'])
@@ -633,56 +756,37 @@ def draw_custom_coords_endpoint():
     
     try:
         data = request.get_json()
-        logger.info(f"Received custom coordinates request: {json.dumps(data, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Received custom coordinates request: %s", json.dumps(data, indent=2))
         
         coordinates_text = data.get('coordinates_text', '')
         color = data.get('color', '#cccccc')
         name = data.get('name', 'CustomMesh')
         use_convex_hull = data.get('use_convex_hull', True)
         
-        if isinstance(coordinates_text, list):
-            # Frontend sent points as list of objects [{x, y, z}, ...]
-            points = coordinates_text
-            coordinates_text_str = '\n'.join([f"{float(p.get('x', 0))} {float(p.get('y', 0))} {float(p.get('z', 0))}" for p in points])
-            logger.info(f"Converted {len(points)} points from array to text format")
-        elif isinstance(coordinates_text, str):
-            coordinates_text_str = coordinates_text.strip()
-            if not coordinates_text_str:
+        if isinstance(coordinates_text, str):
+            coordinates_text = coordinates_text.strip()
+            if not coordinates_text:
                 return jsonify({"error": "Coordinates text is required"}), 400
-        else:
+        elif not isinstance(coordinates_text, list):
+            # Frontend sends either "X Y Z" lines or a list of objects [{x, y, z}, ...]
             return jsonify({"error": "Invalid coordinates format"}), 400
         
-        logger.info(f"Final coordinates text:\n{coordinates_text_str}")
+        # Parsed in C by numpy; the slow per-line walk only runs to describe invalid input
+        coords, parse_error = blender_service.parse_coordinates(coordinates_text)
+        if parse_error:
+            return jsonify({"error": parse_error}), 400
         
-        lines = [line.strip() for line in coordinates_text_str.split('\n') if line.strip()]
-        if len(lines) < 3:
-            return jsonify({"error": f"At least 3 coordinate points are required, got {len(lines)}"}), 400
+        logger.info("Successfully parsed %d coordinate points", len(coords))
         
-        parsed_points = []
-        for i, line in enumerate(lines):
-            parts = line.split()
-            if len(parts) != 3:
-                return jsonify({"error": f"Invalid coordinate format at line {i+1}: '{line}'. Expected 'X Y Z'"}), 400
-            try:
-                x, y, z = [float(x) for x in parts]
-                parsed_points.append((x, y, z))
-            except ValueError:
-                return jsonify({"error": f"Invalid numeric values at line {i+1}: '{line}'"}), 400
-        
-        logger.info(f"Successfully parsed {len(parsed_points)} coordinate points:")
-        for i, (x, y, z) in enumerate(parsed_points):
-            logger.info(f"  Point {i+1}: ({x}, {y}, {z})")
-        
-        logger.info(f"Creating custom mesh with convex_hull={use_convex_hull}")
+        logger.info("Creating custom mesh with convex_hull=%s", use_convex_hull)
         
         color_obj = blender_service._convert_hex_to_rgba(color)
         
         session_data = {
-            "session_id": str(uuid.uuid4()),
-            "clear_scene": True,
             "commands": [
                 ("custom_coords", {
-                    "coordinates_text": coordinates_text_str,
+                    "points_f64": blender_service.pack_floats(coords),
                     "color": color_obj,
                     "name": name,
                     "use_convex_hull": use_convex_hull
@@ -692,59 +796,43 @@ def draw_custom_coords_endpoint():
             "output_name": f"custom_mesh_{name.lower().replace(' ', '_')}"
         }
         
-        logger.info(f"Session data created: {json.dumps(session_data, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Session data created: %s", json.dumps(session_data, indent=2, default=str))
         
         success, output_path, error = blender_service.execute_drawing_session(session_data)
         
-        logger.info(f"Blender service result: success={success}, output_path={output_path}, error={error}")
+        logger.info("Blender service result: success=%s, output_path=%s, error=%s", success, output_path, error)
         
         if success and output_path:
-            if not os.path.exists(output_path):
-                logger.error(f"Output file does not exist: {output_path}")
+            try:
+                output_size = os.stat(output_path).st_size
+            except FileNotFoundError:
+                logger.error("Output file does not exist: %s", output_path)
                 return jsonify({"success": False, "error": "Generated file not found"}), 500
-            
-            output_size = os.path.getsize(output_path)
-            logger.info(f"Generated file size: {output_size} bytes")
+            logger.info("Generated file size: %d bytes", output_size)
             
             if output_size < 100:
-                logger.warning(f"Generated file is very small ({output_size} bytes), reading content for debug:")
+                logger.warning("Generated file is very small (%d bytes), reading content for debug:", output_size)
                 try:
                     with open(output_path, 'r') as f:
                         content = f.read()
-                    logger.warning(f"File content preview:\n{content}")
+                    logger.warning("File content preview:\n%s", content)
                 except Exception as e:
-                    logger.error(f"Failed to read generated file: {e}")
-            
-            filename = os.path.basename(output_path)
-            dest_path = MODELS_FOLDER / filename
-            cleanup_generated_files(output_path, dest_path)
-            
-            file_stats = dest_path.stat()
-            logger.info(f"Copied file size: {file_stats.st_size} bytes")
-            
-            new_model = {
-                "id": str(uuid.uuid4()),
-                "name": name,
-                "description": f"Custom mesh from coordinates ({len(lines)} vertices, convex_hull={use_convex_hull})",
-                "modelUrl": f"/models/{filename}",
-                "format": "obj",
-                "category": "generated",
-                "fileSize": file_stats.st_size,
-                "createdAt": datetime.now().isoformat(),
-                "isGenerated": True
-            }
+                    logger.error("Failed to read generated file: %s", e)
             
-            models.append(new_model)
-            save_data_to_file(models, MODELS_DB_FILE, "models")
+            new_model = register_generated_model(
+                output_path, name,
+                f"Custom mesh from coordinates ({len(coords)} vertices, convex_hull={use_convex_hull})"
+            )
             
-            logger.info(f"Successfully created custom mesh model: {new_model}")
+            logger.info("Successfully created custom mesh model: %s", new_model)
             return jsonify({"success": True, "model": new_model}), 201
         else:
-            logger.error(f"Custom mesh creation failed: {error}")
+            logger.error("Custom mesh creation failed: %s", error)
             return jsonify({"success": False, "error": error or "Failed to create custom mesh"}), 500
             
     except Exception as e:
-        logger.error(f"Exception in custom mesh creation: {e}", exc_info=True)
+        logger.exception("Exception in custom mesh creation: %s", e)
         return jsonify({"success": False, "error": str(e)}), 500
 
 @app.route('/api/models/<model_id>/update', methods=['POST', 'OPTIONS'])
@@ -765,7 +853,8 @@ def update_model(model_id):
         if not update_data:
             return jsonify({"error": "No update data provided"}), 400
         
-        logger.info(f"Updating model {model_id} with data: {json.dumps(update_data, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Updating model %s with data: %s", model_id, json.dumps(update_data, indent=2))
         
         original_filename = model["modelUrl"].split("/")[-1]
         original_path = MODELS_FOLDER / original_filename
@@ -789,12 +878,7 @@ def update_model(model_id):
             mat_data = update_data["material"]
             
             if "color" in mat_data:
-                color_hex = mat_data["color"]
-                if color_hex.startswith('#'):
-                    color_hex = color_hex[1:]
-                r = int(color_hex[0:2], 16) / 255.0
-                g = int(color_hex[2:4], 16) / 255.0
-                b = int(color_hex[4:6], 16) / 255.0
+                r, g, b, _ = blender_service._convert_hex_to_rgba(mat_data["color"])
                 material_spec["color"] = [r, g, b, 1.0]
             
             if "roughness" in mat_data:
@@ -804,12 +888,7 @@ def update_model(model_id):
                 material_spec["metallic"] = float(mat_data["metalness"])
             
             if "emissive" in mat_data:
-                emissive_hex = mat_data["emissive"]
-                if emissive_hex.startswith('#'):
-                    emissive_hex = emissive_hex[1:]
-                r = int(emissive_hex[0:2], 16) / 255.0
-                g = int(emissive_hex[2:4], 16) / 255.0
-                b = int(emissive_hex[4:6], 16) / 255.0
+                r, g, b, _ = blender_service._convert_hex_to_rgba(mat_data["emissive"])
                 material_spec["emission"] = [r, g, b]
             
             if "emissiveIntensity" in mat_data:
@@ -817,11 +896,11 @@ def update_model(model_id):
             
             if "textureId" in mat_data and mat_data["textureId"]:
                 material_spec["textureId"] = str(mat_data["textureId"])
-                logger.info(f"Adding texture ID to material spec: {mat_data['textureId']}")
+                logger.info("Adding texture ID to material spec: %s", mat_data['textureId'])
             
             if "textureScale" in mat_data:
                 material_spec["textureScale"] = float(mat_data["textureScale"])
-                logger.info(f"Adding texture scale to material spec: {mat_data['textureScale']}")
+                logger.info("Adding texture scale to material spec: %s", mat_data['textureScale'])
             
             if material_spec:
                 blender_update_spec["material"] = material_spec
@@ -831,52 +910,28 @@ def update_model(model_id):
         safe_name = safe_name.replace(' ', '_')
         output_name = f"{safe_name}_edited"
         
-        logger.info(f"Blender update spec: {json.dumps(blender_update_spec, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Blender update spec: %s", json.dumps(blender_update_spec, indent=2))
         
-        success, updated_model_path, error = blender_service.update_model(
+        output_filename = f"{model_id}_edited.obj"
+        static_output_path = MODELS_FOLDER / output_filename
+        
+        # The service copies the result (MTL and textures included) into the models folder itself,
+        # so its cached output cannot be evicted and deleted before it is published
+        success, _, error = blender_service.update_model(
             str(original_path), 
             blender_update_spec,
-            output_name
+            output_name,
+            destination=str(static_output_path)
         )
         
         if not success:
-            logger.error(f"Failed to update model: {error}")
+            logger.error("Failed to update model: %s", error)
             return jsonify({"error": f"Failed to update model: {error}"}), 500
         
-        output_filename = f"{model_id}_edited.obj"
-        static_output_path = MODELS_FOLDER / output_filename
-        
         try:
-            shutil.copy2(updated_model_path, static_output_path)
-            
-            mtl_source = updated_model_path.replace('.obj', '.mtl')
-            if os.path.exists(mtl_source):
-                mtl_output_path = static_output_path.with_suffix('.mtl')
-                shutil.copy2(mtl_source, mtl_output_path)
-                logger.info(f"Copied MTL file to: {mtl_output_path}")
-                
-                try:
-                    with open(mtl_source, 'r') as f:
-                        mtl_content = f.read()
-                    
-                    import re
-                    texture_references = re.findall(r'map_\w+\s+(\S+)', mtl_content)
-                    
-                    for texture_ref in texture_references:
-                        texture_source = os.path.join(os.path.dirname(mtl_source), texture_ref)
-                        if os.path.exists(texture_source):
-                            texture_dest = MODELS_FOLDER / texture_ref
-                            if not texture_dest.exists():
-                                shutil.copy2(texture_source, texture_dest)
-                                logger.info(f"Copied texture file: {texture_ref}")
-                        else:
-                            logger.warning(f"Texture file not found: {texture_source}")
-                            
-                except Exception as texture_error:
-                    logger.warning(f"Error copying texture files: {texture_error}")
-            
             new_model = {
-                "id": str(uuid.uuid4()),
+                "id": uuid.uuid4().hex,
                 "name": f"{model['name']} (Edited)",
                 "description": f"Edited version of {model['name']}",
                 "format": "obj",
@@ -890,10 +945,7 @@ def update_model(model_id):
                 "originalModelId": model_id
             }
             
-            models.append(new_model)
-            save_data_to_file(models, MODELS_DB_FILE, "models")
-            
-            logger.info(f"Saved {len(models)} models to database")
+            add_model_entry(new_model)
             
             return jsonify({
                 "success": True,
@@ -901,12 +953,12 @@ def update_model(model_id):
                 "updatedModel": new_model
             })
             
-        except Exception as copy_error:
-            logger.error(f"Failed to copy updated model: {copy_error}")
-            return jsonify({"error": f"Failed to save updated model: {str(copy_error)}"}), 500
+        except Exception as save_error:
+            logger.error("Failed to save updated model: %s", save_error)
+            return jsonify({"error": f"Failed to save updated model: {str(save_error)}"}), 500
         
     except Exception as e:
-        logger.error(f"Error updating model: {e}")
+        logger.exception("Error updating model: %s", e)
         import traceback
         traceback.print_exc()
         return jsonify({"error": f"Failed to update model: {str(e)}"}), 500
@@ -935,14 +987,14 @@ def index():
 
 @app.errorhandler(Exception)
 def handle_exception(e):
-    logger.error(f"Unhandled exception: {e}", exc_info=True)
+    logger.exception("Unhandled exception: %s", e)
     return jsonify({"error": "Internal server error"}), 500
 
 def start_flask_app():
     """Start Flask app with error handling"""
     try:
         logger.info("Starting Flask application...")
-        app.run(debug=True, host='0.0.0.0', port=5000, use_reloader=False)
+        app.run(debug=True, host='0.0.0.0', port=5000, use_reloader=False, threaded=True)
     except Exception as e:
         logger.error(f"Failed to start Flask app: {e}", exc_info=True)
         raise
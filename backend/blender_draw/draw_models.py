@@ -8,7 +8,7 @@ import bmesh  # type: ignore
 import mathutils  # type: ignore
 import os
 import uuid
-from typing import List, Tuple
+from typing import List, Tuple, Optional
 from pathlib import Path
 
 # Use simple models - no pydantic dependency
@@ -17,26 +17,19 @@ from .simple_models import Point3D, Color, parse_command_data
 
 def clear_scene() -> None:
     """
-    Clear all mesh objects from the current Blender scene.
-    Keeps cameras and lights intact.
+    Remove every object except cameras and lights from the current Blender file,
+    along with the mesh, curve and material data they leave unused.
     """
-    # Select all mesh objects
-    bpy.ops.object.select_all(action='DESELECT')
-    
-    # Delete all mesh objects using data API
-    for obj in bpy.context.scene.objects:
-        if obj.type == 'MESH':
-            bpy.data.objects.remove(obj, do_unlink=True)
-    
-    # Clean up orphaned mesh data
-    for mesh in bpy.data.meshes:
-        if mesh.users == 0:
-            bpy.data.meshes.remove(mesh)
-    
-    # Clean up orphaned materials
-    for material in bpy.data.materials:
-        if material.users == 0:
-            bpy.data.materials.remove(material)
+    # batch_remove drops each group in one pass instead of one depsgraph update per datablock,
+    # which keeps scene resets cheap inside the persistent worker. Curves and other non-mesh
+    # objects go too: the OBJ export takes the whole scene, so anything left from an earlier
+    # session would end up in this session's file.
+    bpy.data.batch_remove([obj for obj in bpy.data.objects if obj.type not in {'CAMERA', 'LIGHT'}])
+    
+    # Clean up orphaned geometry data, then the materials it was holding
+    bpy.data.batch_remove([mesh for mesh in bpy.data.meshes if mesh.users == 0])
+    bpy.data.batch_remove([curve for curve in bpy.data.curves if curve.users == 0])
+    bpy.data.batch_remove([material for material in bpy.data.materials if material.users == 0])
 
 
 def _create_material(name: str, color: Color):
@@ -193,18 +186,18 @@ def draw_line(points: List[Point3D], color: Color, thickness: float = 0.01, name
     # Create bmesh for easier mesh manipulation
     bm = bmesh.new()
     
-    # Add optimized vertices
-    vertices = []
+    # Add optimized vertices; the bound constructors skip an attribute lookup per element
+    new_vert = bm.verts.new
     optimized_vertices = compressed_data["vertices"]
-    for i in range(0, len(optimized_vertices), 3):
-        vert = bm.verts.new((optimized_vertices[i], optimized_vertices[i+1], optimized_vertices[i+2]))
-        vertices.append(vert)
+    vertices = [new_vert(co) for co in zip(optimized_vertices[0::3], optimized_vertices[1::3], optimized_vertices[2::3])]
     
     # Create edges between consecutive vertices using original point order
+    new_edge = bm.edges.new
     vertex_indices = compressed_data["vertex_indices"]
-    for i in range(len(vertex_indices) - 1):
-        if vertex_indices[i] < len(vertices) and vertex_indices[i+1] < len(vertices):
-            bm.edges.new([vertices[vertex_indices[i]], vertices[vertex_indices[i+1]]])
+    vertex_count = len(vertices)
+    for start, end in zip(vertex_indices, vertex_indices[1:]):
+        if start < vertex_count and end < vertex_count:
+            new_edge((vertices[start], vertices[end]))
     
     # Convert to mesh with thickness using solidify
     if thickness > 0:
@@ -533,14 +526,14 @@ def execute_drawing_session(session_data: dict) -> Tuple[str, str]:
         Tuple of (session_id, output_file_path)
     """
     session_id = session_data.get("session_id", str(uuid.uuid4()))
-    clear_scene_flag = session_data.get("clear_scene", True)
     commands = session_data.get("commands", [])
     output_format = session_data.get("output_format", "obj")
     output_name = session_data.get("output_name", "drawing")
     
-    # Clear scene if requested
-    if clear_scene_flag:
-        clear_scene()
+    # Always start from an empty scene. Persistent workers keep the scene between sessions and the
+    # export takes the whole scene, so keeping meshes would leak other requests' objects into this
+    # output; a "clear_scene" value sent by older clients is therefore ignored.
+    clear_scene()
     
     created_objects = []
     
@@ -578,7 +571,8 @@ def execute_drawing_session(session_data: dict) -> Tuple[str, str]:
             elif cmd_type == "custom_coords":
                 obj_name = draw_custom_mesh_from_coords(
                     parsed_data["coordinates_text"], parsed_data["color"],
-                    parsed_data["name"], parsed_data["use_convex_hull"]
+                    parsed_data["name"], parsed_data["use_convex_hull"],
+                    points_flat=parsed_data["points_flat"]
                 )
         
             created_objects.append(obj_name)
@@ -610,7 +604,8 @@ def optimize_vertices(vertices: List[Tuple[float, float, float]], precision: int
 
 
 def draw_custom_mesh_from_coords(coordinates_text: str, color: Color, name: str = "CustomMesh", 
-                                use_convex_hull: bool = True) -> str:
+                                use_convex_hull: bool = True,
+                                points_flat: Optional[List[float]] = None) -> str:
     """
     Create a custom mesh from coordinate text input with vertex optimization.
     
@@ -619,6 +614,7 @@ def draw_custom_mesh_from_coords(coordinates_text: str, color: Color, name: str
         color: Mesh color
         name: Object name
         use_convex_hull: Whether to apply convex hull operation
+        points_flat: Already parsed coordinates as [x0, y0, z0, x1, ...]; skips text parsing
         
     Returns:
         Name of created object
@@ -626,8 +622,12 @@ def draw_custom_mesh_from_coords(coordinates_text: str, color: Color, name: str
     Raises:
         ValueError: If coordinates are invalid
     """
-    # Parse coordinates from text
+    # Parse coordinates from text unless they were sent pre-parsed
     vertices = []
+    if points_flat:
+        vertices = list(zip(points_flat[0::3], points_flat[1::3], points_flat[2::3]))
+        coordinates_text = ""
+    
     for i, line in enumerate(coordinates_text.strip().splitlines()):
         line = line.strip()
         if not line:
@@ -660,19 +660,18 @@ def draw_custom_mesh_from_coords(coordinates_text: str, color: Color, name: str
     obj = bpy.data.objects.new(name, mesh)
     
     # Reconstruct optimized vertices
-    optimized_vertices = []
     flattened = compressed_data["vertices"]
-    for i in range(0, len(flattened), 3):
-        optimized_vertices.append((flattened[i], flattened[i+1], flattened[i+2]))
+    optimized_vertices = list(zip(flattened[0::3], flattened[1::3], flattened[2::3]))
     
     # Create initial mesh from optimized vertices
     if use_convex_hull:
+        # Load all optimized vertices in one bulk call
+        mesh.vertices.add(len(optimized_vertices))
+        mesh.vertices.foreach_set("co", flattened)
+        
         # Create bmesh for convex hull operation
         bm = bmesh.new()
-        
-        # Add optimized vertices to bmesh
-        for vertex in optimized_vertices:
-            bm.verts.new(vertex)
+        bm.from_mesh(mesh)
         
         # Apply convex hull to generate faces
         bmesh.ops.convex_hull(bm, input=bm.verts)
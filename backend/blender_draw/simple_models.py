@@ -3,6 +3,9 @@ Simple data models for Blender drawing that don't require pydantic.
 Used when running inside Blender's Python environment.
 """
 
+import sys
+import base64
+from array import array
 from typing import List, Tuple, Optional, Dict, Any
 
 
@@ -64,6 +67,39 @@ class Color:
         return (self.r, self.g, self.b, self.a)
 
 
+def _points_from_flat(points_flat: List[float]) -> List[Point3D]:
+    """Build points from a flat [x0, y0, z0, x1, y1, z1, ...] coordinate list."""
+    return [
+        Point3D(points_flat[i], points_flat[i + 1], points_flat[i + 2])
+        for i in range(0, len(points_flat) - 2, 3)
+    ]
+
+
+def _unpack_floats(packed: str) -> List[float]:
+    """Decode the base64 little-endian float64 arrays sent by the service for large point sets."""
+    values = array("d", base64.b64decode(packed))
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values.tolist()
+
+
+def _parse_color(color_data: Any, default: Color) -> Color:
+    """Parse a color given as an RGBA dict, an [r, g, b(, a)] list or a hex string."""
+    if color_data is None:
+        return default
+    if isinstance(color_data, dict):
+        return Color(
+            r=color_data.get("r", default.r),
+            g=color_data.get("g", default.g),
+            b=color_data.get("b", default.b),
+            a=color_data.get("a", default.a)
+        )
+    if isinstance(color_data, (list, tuple)) and len(color_data) >= 3:
+        return Color(*color_data[:4])
+    # Handle hex color string
+    return Color.from_hex(str(color_data))
+
+
 def parse_command_data(cmd_type: str, cmd_data: dict) -> dict:
     """
     Parse command data from dictionary format to our internal format.
@@ -76,8 +112,8 @@ def parse_command_data(cmd_type: str, cmd_data: dict) -> dict:
         Parsed command data
     """
     if cmd_type == "line":
-        # Parse line command
-        points = []
+        # Parse line command, preferring the flat coordinate layout
+        points = _points_from_flat(cmd_data.get("points_flat", []))
         for point_data in cmd_data.get("points", []):
             if isinstance(point_data, dict):
                 points.append(Point3D(
@@ -88,17 +124,7 @@ def parse_command_data(cmd_type: str, cmd_data: dict) -> dict:
             elif isinstance(point_data, (list, tuple)) and len(point_data) >= 3:
                 points.append(Point3D(x=point_data[0], y=point_data[1], z=point_data[2]))
         
-        color_data = cmd_data.get("color", {"r": 1.0, "g": 1.0, "b": 1.0, "a": 1.0})
-        if isinstance(color_data, dict):
-            color = Color(
-                r=color_data.get("r", 1.0),
-                g=color_data.get("g", 1.0),
-                b=color_data.get("b", 1.0),
-                a=color_data.get("a", 1.0)
-            )
-        else:
-            # Handle hex color
-            color = Color.from_hex(str(color_data))
+        color = _parse_color(cmd_data.get("color"), Color(1.0, 1.0, 1.0, 1.0))
         
         return {
             "points": points,
@@ -120,16 +146,7 @@ def parse_command_data(cmd_type: str, cmd_data: dict) -> dict:
             elif isinstance(point_data, (list, tuple)) and len(point_data) >= 3:
                 points.append(Point3D(x=point_data[0], y=point_data[1], z=point_data[2]))
         
-        color_data = cmd_data.get("color", {"r": 1.0, "g": 1.0, "b": 1.0, "a": 1.0})
-        if isinstance(color_data, dict):
-            color = Color(
-                r=color_data.get("r", 1.0),
-                g=color_data.get("g", 1.0),
-                b=color_data.get("b", 1.0),
-                a=color_data.get("a", 1.0)
-            )
-        else:
-            color = Color.from_hex(str(color_data))
+        color = _parse_color(cmd_data.get("color"), Color(1.0, 1.0, 1.0, 1.0))
         
         return {
             "control_points": points,
@@ -152,16 +169,7 @@ def parse_command_data(cmd_type: str, cmd_data: dict) -> dict:
             elif isinstance(vertex_data, (list, tuple)) and len(vertex_data) >= 3:
                 vertices.append(Point3D(x=vertex_data[0], y=vertex_data[1], z=vertex_data[2]))
         
-        color_data = cmd_data.get("color", {"r": 1.0, "g": 1.0, "b": 1.0, "a": 1.0})
-        if isinstance(color_data, dict):
-            color = Color(
-                r=color_data.get("r", 1.0),
-                g=color_data.get("g", 1.0),
-                b=color_data.get("b", 1.0),
-                a=color_data.get("a", 1.0)
-            )
-        else:
-            color = Color.from_hex(str(color_data))
+        color = _parse_color(cmd_data.get("color"), Color(1.0, 1.0, 1.0, 1.0))
         
         return {
             "vertices": vertices,
@@ -215,17 +223,7 @@ def parse_command_data(cmd_type: str, cmd_data: dict) -> dict:
             rotation = Point3D(x=0, y=0, z=0)
         
         # Parse color
-        color_data = cmd_data.get("color", {"r": 0.5, "g": 0.5, "b": 1.0, "a": 1.0})
-        if isinstance(color_data, dict):
-            color = Color(
-                r=color_data.get("r", 0.5),
-                g=color_data.get("g", 0.5),
-                b=color_data.get("b", 1.0),
-                a=color_data.get("a", 1.0)
-            )
-        else:
-            # Handle hex color string
-            color = Color.from_hex(str(color_data))
+        color = _parse_color(cmd_data.get("color"), Color(0.5, 0.5, 1.0, 1.0))
         
         return {
             "primitive_type": primitive_type,
@@ -242,21 +240,25 @@ def parse_command_data(cmd_type: str, cmd_data: dict) -> dict:
     elif cmd_type == "custom_coords":
         # Parse custom coordinates command
         coordinates_text = cmd_data.get("coordinates_text", "")
-        color_data = cmd_data.get("color", {"r": 0.8, "g": 0.8, "b": 0.8, "a": 1.0})
         
-        if isinstance(color_data, dict):
-            color = Color(
-                r=color_data.get("r", 0.8),
-                g=color_data.get("g", 0.8),
-                b=color_data.get("b", 0.8),
-                a=color_data.get("a", 1.0)
-            )
-        else:
-            # Handle hex color string
-            color = Color.from_hex(str(color_data))
+        # Pre-parsed points: packed binary, flat list, or the older list-of-dicts format
+        points_flat = cmd_data.get("points_flat")
+        if points_flat is None and cmd_data.get("points_f64"):
+            points_flat = _unpack_floats(cmd_data["points_f64"])
+        elif points_flat is None and cmd_data.get("coordinates_points"):
+            points_flat = []
+            for point_data in cmd_data["coordinates_points"]:
+                points_flat.extend((
+                    point_data.get("x", 0),
+                    point_data.get("y", 0),
+                    point_data.get("z", 0)
+                ))
+        
+        color = _parse_color(cmd_data.get("color"), Color(0.8, 0.8, 0.8, 1.0))
         
         return {
             "coordinates_text": coordinates_text,
+            "points_flat": points_flat,
             "color": color,
             "name": cmd_data.get("name", "CustomMesh"),
             "use_convex_hull": cmd_data.get("use_convex_hull", True)
@@ -5,936 +5,1182 @@ Service for executing Blender drawing commands in headless mode.
 import subprocess
 import json
 import uuid
-import tempfile
+import secrets
 import os
+import io
+import base64
+import math
+import shutil
+import atexit
+import functools
+import hashlib
+import re
+import collections
+import itertools
+import threading
+import queue
+import asyncio
+import concurrent.futures
 from pathlib import Path
-from typing import Dict, Any, Tuple, Optional
+from typing import Dict, Any, List, Tuple, Optional, Union
 
-class BlenderDrawingService:
-    """Service for executing Blender drawing operations."""
-    
-    def __init__(self, blender_executable: str = r"C:\Program Files\Blender Foundation\Blender 4.4\blender.exe"):
-        self.blender_executable = blender_executable
-        self.timeout = 300  
-    
-    def _create_execution_script(self, session_file: str, result_file: str) -> str:
-        """Create Python script for Blender execution."""
-        session_file_repr = repr(session_file)
-        result_file_repr = repr(result_file)
-        
-        return f'''
-import sys
-import json
-import os
-from pathlib import Path
-import traceback
+import numpy as np
 
-# Enable all logging
-import logging
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
-logger = logging.getLogger(__name__)
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard library
+    orjson = None
 
-logger.info("Starting Blender execution script")
 
-# Find backend directory containing blender_draw module
-backend_candidates = [
-    Path(os.getcwd()),
-    Path(os.getcwd()) / "backend",
-    Path(__file__).parent.parent,
-    Path(__file__).parent.parent / "backend"
-]
+def _json_default(value: Any) -> Any:
+    """Fallback encoder for values the JSON encoder does not handle natively."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
 
-backend_dir = None
-for candidate in backend_candidates:
-    logger.debug(f"Checking backend candidate: {{candidate}}")
-    if (candidate / "blender_draw").exists():
-        backend_dir = candidate
-        logger.info(f"Found backend directory: {{backend_dir}}")
-        break
 
-if not backend_dir:
-    error_msg = f"Could not find blender_draw module in candidates: {{[str(c) for c in backend_candidates]}}"
-    logger.error(error_msg)
-    raise ImportError(error_msg)
+def _json_dumps(data: Any) -> bytes:
+    """Serialize data to UTF-8 JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(data, default=_json_default).encode("utf-8")
 
-sys.path.insert(0, str(backend_dir))
-logger.info(f"Added to Python path: {{str(backend_dir)}}")
 
-try:
-    logger.info("Importing blender_draw.draw_models")
-    from blender_draw.draw_models import execute_drawing_session
+def _json_loads(raw: bytes) -> Any:
+    """Deserialize JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+# Static scripts run inside Blender; paths are passed via argv
+BACKEND_DIR = Path(__file__).resolve().parent
+SESSION_SCRIPT = BACKEND_DIR / "blender_worker.py"
+UPDATE_SCRIPT = BACKEND_DIR / "blender_update.py"
+# Prefix of result lines written by blender_worker.py in --serve mode
+RESULT_SENTINEL = b"@@BLENDER_RESULT@@"
+# Extra Popen arguments for Blender processes. No cwd and no fd sweep keep CPython on its
+# posix_spawn/vfork fast path; on Windows Blender gets no console window.
+if os.name == "nt":
+    SPAWN_OPTIONS: Dict[str, Any] = {"creationflags": subprocess.CREATE_NO_WINDOW}
+else:
+    SPAWN_OPTIONS = {"close_fds": False}
+
+
+def _serve_command(blender_executable: str, log_level: str) -> List[str]:
+    """Command line running blender_worker.py in --serve mode (sessions on stdin, results on stdout)."""
+    return [
+        blender_executable,
+        "--background",
+        "--python", str(SESSION_SCRIPT),
+        "--",
+        "--serve",
+        "--log-level", log_level,
+        "--backend-dir", str(BACKEND_DIR)
+    ]
+
+
+class BlenderWorker:
+    """
+    Long-lived Blender process running blender_worker.py in --serve mode.
+    
+    Sessions are sent as JSON lines on stdin; results come back as sentinel-prefixed
+    JSON lines on stdout. The process is started ahead of the first session and
+    replaced as soon as it dies or times out, so Blender's startup cost stays off
+    the request path.
+    """
     
-    logger.info(f"Reading session data from: {session_file_repr}")
-    with open({session_file_repr}, "r") as f:
-        session_data = json.load(f)
+    def __init__(self, blender_executable: str, log_level: str = "WARNING",
+                 timeout: float = 300, debug: bool = False):
+        self.blender_executable = blender_executable
+        self.log_level = log_level
+        self.timeout = timeout
+        self.debug = debug
+        self._proc: Optional[subprocess.Popen] = None
+        self._results: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        self._lock = threading.Lock()
+        # Set by close(); a closed worker never starts a new process
+        self._closed = False
+    
+    @property
+    def closed(self) -> bool:
+        """Whether close() was called; a closed worker runs no more sessions."""
+        return self._closed
+    
+    def start(self) -> None:
+        """Spawn the process now if it is not running, so it warms up before the first session."""
+        with self._lock:
+            if self._proc is None or self._proc.poll() is not None:
+                self._start()
+    
+    def _start(self) -> None:
+        """Spawn the Blender process and the thread draining its stdout."""
+        cmd = _serve_command(self.blender_executable, self.log_level)
+        if self.debug:
+            print(f"Starting persistent Blender worker: {' '.join(cmd)}")
+        
+        self._proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            # Worker logs go to the server console in debug mode, nowhere otherwise
+            stderr=None if self.debug else subprocess.DEVNULL,
+            **SPAWN_OPTIONS
+        )
+        self._results = queue.Queue()
+        threading.Thread(target=self._read_stdout, args=(self._proc, self._results), daemon=True).start()
+    
+    def _read_stdout(self, proc: subprocess.Popen, results: "queue.Queue[Optional[bytes]]") -> None:
+        """Forward result lines to the queue; a None entry signals that the process exited."""
+        for line in proc.stdout:
+            # Matched anywhere: output left without a trailing newline may precede the sentinel
+            index = line.find(RESULT_SENTINEL)
+            if index >= 0:
+                results.put(line[index + len(RESULT_SENTINEL):])
+            elif self.debug:
+                print(f"Blender worker: {line.decode(errors='replace').rstrip()}")
+        results.put(None)
+    
+    def run(self, session_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute one drawing session in the worker.
+        
+        Raises:
+            subprocess.TimeoutExpired: If the worker does not answer within the timeout
+            RuntimeError: If the worker exits or its pipe breaks
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Blender worker is closed")
+            if self._proc is None or self._proc.poll() is not None:
+                self._start()
+            
+            try:
+                self._proc.stdin.write(_json_dumps(session_data) + b"\n")
+                self._proc.stdin.flush()
+                line = self._results.get(timeout=self.timeout)
+            except queue.Empty:
+                cmd = self._proc.args
+                try:
+                    self._restart()
+                except OSError as e:
+                    # Still a timeout for the caller; the next run() tries to start the worker again
+                    print(f"Could not restart Blender worker after a timeout: {e}")
+                raise subprocess.TimeoutExpired(cmd, self.timeout)
+            except OSError as e:
+                self._restart()
+                raise RuntimeError(f"Blender worker pipe error: {e}")
+            
+            if line is None:
+                self._restart()
+                raise RuntimeError("Blender worker exited unexpectedly")
+            return _json_loads(line)
     
-    logger.info(f"Session data loaded: {{json.dumps(session_data, indent=2)}}")
+    def _restart(self) -> None:
+        """Replace a failed process right away so the next session finds a warm one."""
+        self._kill()
+        if not self._closed:
+            self._start()
     
-    logger.info("Executing drawing session...")
-    session_id, output_path = execute_drawing_session(session_data)
-    logger.info(f"Drawing session completed: session_id={{session_id}}, output_path={{output_path}}")
+    def _kill(self) -> None:
+        """Terminate the current process; the next run() starts a fresh one."""
+        if self._proc is not None:
+            self._proc.kill()
+            self._proc.wait()
+            self._proc = None
     
-    # Verify output file exists
-    if output_path and os.path.exists(output_path):
-        file_size = os.path.getsize(output_path)
-        logger.info(f"Output file exists with size: {{file_size}} bytes")
+    def close(self) -> None:
+        """
+        Close stdin so the worker exits its loop, killing it if it does not.
         
-        # Read and log file content preview for debugging
-        if file_size < 1000:  # Only for small files
+        Runs at exit, when a session may still hold the lock for up to the timeout;
+        instead of waiting for it, the process is killed without the lock.
+        """
+        self._closed = True
+        if not self._lock.acquire(timeout=1):
+            proc = self._proc
+            if proc is not None:
+                proc.kill()
+            return
+        try:
+            if self._proc is None:
+                return
             try:
-                with open(output_path, 'r') as f:
-                    content = f.read()
-                logger.info(f"File content preview:\\n{{content[:500]}}")
-            except Exception as e:
-                logger.warning(f"Could not read file content: {{e}}")
-    else:
-        logger.error(f"Output file does not exist: {{output_path}}")
-    
-    result = {{
-        "success": True,
-        "session_id": session_id,
-        "output_path": str(output_path),
-        "error": None
-    }}
-    
-except Exception as e:
-    error_msg = str(e)
-    tb = traceback.format_exc()
-    logger.error(f"Exception occurred: {{error_msg}}")
-    logger.error(f"Traceback:\\n{{tb}}")
-    
-    result = {{
-        "success": False,
-        "session_id": None,
-        "output_path": None,
-        "error": error_msg,
-        "traceback": tb
-    }}
+                self._proc.stdin.close()
+                self._proc.wait(timeout=10)
+                self._proc = None
+            except (OSError, subprocess.TimeoutExpired):
+                self._kill()
+        finally:
+            self._lock.release()
 
-logger.info(f"Writing result to: {result_file_repr}")
-with open({result_file_repr}, "w") as f:
-    json.dump(result, f, indent=2)
 
-logger.info("Blender execution script completed")
-'''
+class BlenderDrawingService:
+    """Service for executing Blender drawing operations."""
+    
+    # Keys of the normalized update spec that require re-importing the mesh
+    TRANSFORM_KEYS = ("location", "rotation", "scale")
+    # Values of those keys that leave the mesh unchanged
+    IDENTITY_TRANSFORM = {"location": [0.0, 0.0, 0.0], "rotation": [0.0, 0.0, 0.0], "scale": [1.0, 1.0, 1.0]}
+    # Maximum number of remembered update results
+    UPDATE_CACHE_SIZE = 64
+    # Vertices transformed per numpy batch when rewriting OBJ files
+    TRANSFORM_BATCH_SIZE = 1024
+    # Lines of Blender output kept for error messages of one-shot runs
+    OUTPUT_TAIL_LINES = 50
+    
+    def __init__(self, blender_executable: str = r"C:\Program Files\Blender Foundation\Blender 4.4\blender.exe",
+                 debug: bool = False, persistent_worker: bool = True, max_workers: Optional[int] = 1):
+        # Resolve the executable once; a bad path is reported per call instead of after a spawn attempt
+        resolved = shutil.which(blender_executable)
+        self.blender_executable = resolved or blender_executable
+        self._executable_error = None if resolved else f"Blender executable not found: {blender_executable}"
+        self.timeout = 300  
+        self._output_dir = BACKEND_DIR / "output" / "drawings"
+        # Capture Blender output and enable verbose script logging only when debugging
+        self.debug = debug
+        # digest of (source OBJ contents, update spec) -> generated OBJ path
+        self._update_cache: Dict[bytes, str] = {}
+        self._update_cache_lock = threading.Lock()
+        # cache key -> [lock, users] for updates being computed, so identical concurrent updates run once
+        self._update_inflight: Dict[bytes, list] = {}
+        # Drawing sessions go to a pool of long-lived Blender processes; one-shot runs remain the fallback.
+        # Each call borrows an idle worker, so up to max_workers sessions run concurrently;
+        # max_workers=None sizes the pool to half the CPU cores.
+        if max_workers is None:
+            max_workers = (os.cpu_count() or 2) // 2
+        self.max_workers = max(1, max_workers)
+        # One-shot Blender processes (updates, fallbacks) are capped at max_workers so a
+        # burst of requests queues instead of spawning a Blender per request
+        self._one_shot_slots = threading.BoundedSemaphore(self.max_workers)
+        self._workers: List[BlenderWorker] = []
+        self._idle_workers: "queue.Queue[BlenderWorker]" = queue.Queue()
+        # Backs submit(); its threads are only created once sessions are submitted
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers,
+                                                               thread_name_prefix="blender-session")
+        if persistent_worker and not self._executable_error:
+            for _ in range(self.max_workers):
+                worker = BlenderWorker(self.blender_executable, self._log_level(), self.timeout, debug)
+                worker.start()
+                atexit.register(worker.close)
+                self._workers.append(worker)
+                self._idle_workers.put(worker)
+    
+    def _log_level(self) -> str:
+        """Logging level name used by the Blender-side scripts."""
+        return "DEBUG" if self.debug else "WARNING"
     
     def execute_drawing_session(self, session_data: Dict[str, Any]) -> Tuple[bool, Optional[str], Optional[str]]:
         """Execute a drawing session in headless Blender."""
+        if self._executable_error:
+            return False, None, self._executable_error
+        
+        if "session_id" not in session_data:
+            session_data["session_id"] = str(uuid.uuid4())
+        
+        if self.debug:
+            print(f"Executing drawing session with data: {_json_dumps(session_data).decode()}")
+        
+        if self._workers:
+            worker = self._idle_workers.get()
+            try:
+                return self._session_result(worker.run(session_data))
+            except subprocess.TimeoutExpired:
+                # The session itself hung; a one-shot rerun would only wait out a second timeout
+                return False, None, "Blender execution timed out"
+            except (OSError, RuntimeError) as e:
+                if worker.closed:
+                    # Shutting down: do not start a replacement Blender on the way out
+                    return False, None, f"Blender worker stopped: {e}"
+                # The worker could not be started or died; the session gets one run in a fresh process
+                print(f"Persistent Blender worker failed ({e}), running a one-shot Blender process")
+            finally:
+                self._idle_workers.put(worker)
+        
+        return self._execute_blender_command(session_data)
+    
+    def submit(self, session_data: Dict[str, Any]) -> "concurrent.futures.Future[Tuple[bool, Optional[str], Optional[str]]]":
+        """
+        Queue a drawing session and return a Future for its (success, output_path, error) result.
+        
+        Up to max_workers submitted sessions run at once, one per pooled Blender worker.
+        """
+        return self._executor.submit(self.execute_drawing_session, session_data)
+    
+    async def execute_drawing_session_async(self, session_data: Dict[str, Any]) -> Tuple[bool, Optional[str], Optional[str]]:
+        """
+        Async variant of execute_drawing_session.
+        
+        Pooled workers are driven from a thread; one-shot runs spawn Blender with
+        asyncio subprocesses so the event loop is never blocked.
+        """
+        if self._executable_error:
+            return False, None, self._executable_error
+        
+        if self._workers:
+            return await asyncio.to_thread(self.execute_drawing_session, session_data)
+        
         if "session_id" not in session_data:
             session_data["session_id"] = str(uuid.uuid4())
         
-        print(f"Executing drawing session with data: {json.dumps(session_data, indent=2)}")
+        acquire = asyncio.ensure_future(asyncio.to_thread(self._one_shot_slots.acquire))
+        try:
+            await asyncio.shield(acquire)
+        except asyncio.CancelledError:
+            # The waiting thread still takes the slot; hand it back once it does
+            acquire.add_done_callback(lambda _: self._one_shot_slots.release())
+            raise
+        try:
+            return await self._execute_blender_command_async(session_data)
+        finally:
+            self._one_shot_slots.release()
+    
+    def _collect_output_line(self, line: bytes, tail: "collections.deque[bytes]") -> Optional[bytes]:
+        """Return the payload of a result line; keep any other line in the output tail."""
+        # Matched anywhere: output left without a trailing newline may precede the sentinel
+        index = line.find(RESULT_SENTINEL)
+        if index >= 0:
+            if index:
+                tail.append(line[:index] + b"\n")
+            return line[index + len(RESULT_SENTINEL):]
+        tail.append(line)
+        if self.debug:
+            print(f"Blender: {line.decode(errors='replace').rstrip()}")
+        return None
+    
+    def _one_shot_result(self, returncode: int, payload: Optional[bytes],
+                         output_tail: str) -> Tuple[bool, Optional[str], Optional[str]]:
+        """Build the service result of a one-shot session run from its result line or output tail."""
+        if self.debug:
+            print(f"Blender return code: {returncode}")
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
+        if payload is not None:
+            return self._session_result(_json_loads(payload))
+        return False, None, f"Blender execution failed with code {returncode}: {output_tail or 'no output captured'}"
+    
+    async def _execute_blender_command_async(self, session_data: Dict[str, Any]) -> Tuple[bool, Optional[str], Optional[str]]:
+        """Execute Blender command with an asyncio subprocess and return results."""
+        try:
+            cmd = _serve_command(self.blender_executable, self._log_level())
             
-            # Create session and result files
-            session_file = temp_path / "session.json"
-            result_file = temp_path / "result.json"
-            script_file = temp_path / "execute_drawing.py"
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                limit=1 << 20,  # Result lines carry tracebacks; allow more than the 64 KiB default
+                **SPAWN_OPTIONS
+            )
             
-            # Write files
-            with open(session_file, "w") as f:
-                json.dump(session_data, f, default=str, indent=2)
+            async def feed() -> None:
+                # Closing stdin after the single session makes the worker exit; if Blender
+                # already died, its output tail explains why
+                try:
+                    proc.stdin.write(_json_dumps(session_data) + b"\n")
+                    await proc.stdin.drain()
+                    proc.stdin.close()
+                except ConnectionError:
+                    pass
             
-            print(f"Session file written to: {session_file}")
-            print(f"Session data contents: {json.dumps(session_data, indent=2)}")
+            async def consume() -> Tuple[Optional[bytes], "collections.deque[bytes]"]:
+                # Same bounded line-by-line handling as _run_streaming
+                payload = None
+                tail: "collections.deque[bytes]" = collections.deque(maxlen=self.OUTPUT_TAIL_LINES)
+                async for line in proc.stdout:
+                    if payload is None:
+                        payload = self._collect_output_line(line, tail)
+                    else:
+                        tail.append(line)
+                return payload, tail
             
-            script_content = self._create_execution_script(str(session_file), str(result_file))
-            with open(script_file, "w", encoding='utf-8') as f:
-                f.write(script_content)
+            try:
+                _, (payload, tail) = await asyncio.wait_for(asyncio.gather(feed(), consume()), timeout=self.timeout)
+                returncode = await proc.wait()
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                proc.kill()
+                await proc.wait()
+                raise
             
-            return self._execute_blender_command(script_file, result_file)
+            return self._one_shot_result(returncode, payload, b"".join(tail).decode(errors="replace"))
+                
+        except asyncio.TimeoutError:
+            return False, None, "Blender execution timed out"
+        except Exception as e:
+            return False, None, f"Execution error: {str(e)}"
     
-    def _execute_blender_command(self, script_file: Path, result_file: Path) -> Tuple[bool, Optional[str], Optional[str]]:
+    def _run_streaming(self, cmd: List[str], input_data: Optional[bytes] = None) -> Tuple[int, Optional[bytes], str]:
+        """
+        Run a one-shot Blender process and consume its combined output line by line.
+        
+        Only the result line and the last OUTPUT_TAIL_LINES lines are kept, so memory stays
+        bounded however much Blender logs. The process is killed when it exceeds the timeout.
+        
+        Returns:
+            Tuple of (return code, result payload or None, output tail)
+        """
+        proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE if input_data is not None else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            **SPAWN_OPTIONS
+        )
+        timed_out = threading.Event()
+        
+        def kill() -> None:
+            timed_out.set()
+            proc.kill()
+        
+        def feed() -> None:
+            # Written from a thread so a chatty Blender cannot deadlock against a large session
+            try:
+                proc.stdin.write(input_data)
+                proc.stdin.close()
+            except OSError:
+                pass
+        
+        timer = threading.Timer(self.timeout, kill)
+        timer.daemon = True
+        timer.start()
+        if input_data is not None:
+            threading.Thread(target=feed, daemon=True).start()
+        
+        payload = None
+        tail: "collections.deque[bytes]" = collections.deque(maxlen=self.OUTPUT_TAIL_LINES)
+        try:
+            for line in proc.stdout:
+                if payload is None:
+                    payload = self._collect_output_line(line, tail)
+                else:
+                    tail.append(line)
+            returncode = proc.wait()
+        finally:
+            timer.cancel()
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            proc.stdout.close()
+        
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(cmd, self.timeout)
+        return returncode, payload, b"".join(tail).decode(errors="replace")
+    
+    def _execute_blender_command(self, session_data: Dict[str, Any]) -> Tuple[bool, Optional[str], Optional[str]]:
         """Execute Blender command and return results."""
         try:
-            cmd = [
-                self.blender_executable,
-                "--background",
-                "--python", str(script_file)
-            ]
+            cmd = _serve_command(self.blender_executable, self._log_level())
             
-            print(f"Executing Blender command: {' '.join(cmd)}")
+            if self.debug:
+                print(f"Executing Blender command: {' '.join(cmd)}")
             
-            result = subprocess.run(
-                cmd, 
-                capture_output=True, 
-                text=True, 
-                timeout=self.timeout,
-                cwd=str(Path(__file__).parent)
-            )
-            
-            print(f"Blender stdout: {result.stdout}")
-            if result.stderr:
-                print(f"Blender stderr: {result.stderr}")
-            print(f"Blender return code: {result.returncode}")
-            
-            if result_file.exists():
-                with open(result_file, "r") as f:
-                    execution_result = json.load(f)
-                
-                print(f"Execution result: {json.dumps(execution_result, indent=2)}")
-                
-                if execution_result["success"]:
-                    return True, execution_result["output_path"], None
-                else:
-                    error_details = execution_result.get("error", "Unknown error")
-                    if execution_result.get("traceback"):
-                        error_details += f"\n\nTraceback:\n{execution_result['traceback']}"
-                    return False, None, error_details
-            else:
-                return False, None, f"Blender execution failed: {result.stderr}"
+            # The session goes in on stdin and the result comes back on stdout; no temp files
+            with self._one_shot_slots:
+                return self._one_shot_result(*self._run_streaming(cmd, _json_dumps(session_data) + b"\n"))
                 
         except subprocess.TimeoutExpired:
             return False, None, "Blender execution timed out"
         except Exception as e:
             return False, None, f"Execution error: {str(e)}"
     
-    def _convert_hex_to_rgba(self, hex_color: str) -> Dict[str, float]:
-        """Convert hex color to RGBA dictionary."""
+    def _session_result(self, execution_result: Dict[str, Any]) -> Tuple[bool, Optional[str], Optional[str]]:
+        """Convert the result dictionary written by blender_worker.py into the service return tuple."""
+        if self.debug:
+            print(f"Execution result: {execution_result}")
+        
+        if execution_result["success"]:
+            return True, execution_result["output_path"], None
+        else:
+            error_details = execution_result.get("error", "Unknown error")
+            if execution_result.get("traceback"):
+                error_details += f"\n\nTraceback:\n{execution_result['traceback']}"
+            return False, None, error_details
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _convert_hex_to_rgba(hex_color: str) -> Tuple[float, float, float, float]:
+        """Convert hex color to an (r, g, b, a) tuple. Cached, since UI colors repeat."""
         hex_color = hex_color.lstrip('#')
+        # int() would also take signs, underscores and short forms, so check the shape first
+        if len(hex_color) not in (6, 8) or not all(c in "0123456789abcdefABCDEF" for c in hex_color):
+            raise ValueError(f"Invalid hex color '{hex_color}': expected RRGGBB or RRGGBBAA")
         if len(hex_color) == 6:
             hex_color += 'FF'
         
-        return {
-            "r": int(hex_color[0:2], 16) / 255.0,
-            "g": int(hex_color[2:4], 16) / 255.0,
-            "b": int(hex_color[4:6], 16) / 255.0,
-            "a": int(hex_color[6:8], 16) / 255.0
-        }
+        # One int parse of RRGGBBAA, then shift out the channels
+        value = int(hex_color, 16)
+        return (
+            ((value >> 24) & 0xFF) / 255.0,
+            ((value >> 16) & 0xFF) / 255.0,
+            ((value >> 8) & 0xFF) / 255.0,
+            (value & 0xFF) / 255.0
+        )
     
-    def create_line(self, points: list, color: str = "#ffffff", 
-                   thickness: float = 0.01, name: str = "Line") -> Tuple[bool, Optional[str], Optional[str]]:
-        """Create a simple line drawing."""
-        point_objects = [{"x": p[0], "y": p[1], "z": p[2]} for p in points]
-        color_obj = self._convert_hex_to_rgba(color)
+    def execute_batch(self, commands: List[Tuple[str, Dict[str, Any]]],
+                      output_name: str = "batch") -> Tuple[bool, Optional[str], Optional[str]]:
+        """
+        Run several drawing commands in a single Blender session.
         
+        Args:
+            commands: List of (command_type, params) tuples as understood by the session script
+            output_name: Base name of the exported file
+            
+        Returns:
+            Tuple of (success, output_path, error_message)
+        """
+        # execute_drawing_session assigns the session id
         session_data = {
-            "session_id": str(uuid.uuid4()),
-            "clear_scene": True,
-            "commands": [
-                ("line", {
-                    "points": point_objects,
-                    "color": color_obj,
-                    "thickness": thickness,
-                    "name": name
-                })
-            ],
+            "commands": commands,
             "output_format": "obj",
-            "output_name": "line_drawing"
+            "output_name": output_name
         }
         
         return self.execute_drawing_session(session_data)
     
+    def create_line(self, points: list, color: str = "#ffffff", 
+                   thickness: float = 0.01, name: str = "Line") -> Tuple[bool, Optional[str], Optional[str]]:
+        """Create a simple line drawing."""
+        # Flat [x0, y0, z0, x1, y1, z1, ...] layout keeps the payload compact
+        points_flat = [float(c) for p in points for c in p[:3]]
+        color_obj = self._convert_hex_to_rgba(color)
+        
+        return self.execute_batch([
+            ("line", {
+                "points_flat": points_flat,
+                "color": color_obj,
+                "thickness": thickness,
+                "name": name
+            })
+        ], output_name="line_drawing")
+    
     def create_primitive(self, primitive_type: str, location: list = [0, 0, 0],
                         scale: list = [1, 1, 1], color: str = "#8080ff",
                         name: str = "Primitive") -> Tuple[bool, Optional[str], Optional[str]]:
         """Create a primitive shape."""
         color_obj = self._convert_hex_to_rgba(color)
         
-        session_data = {
-            "session_id": str(uuid.uuid4()),
-            "clear_scene": True,
-            "commands": [
-                ("primitive", {
-                    "primitive_type": primitive_type,
-                    "location": {"x": location[0], "y": location[1], "z": location[2]},
-                    "scale": {"x": scale[0], "y": scale[1], "z": scale[2]},
-                    "rotation": {"x": 0, "y": 0, "z": 0},
-                    "color": color_obj,
-                    "name": name
-                })
-            ],
-            "output_format": "obj",
-            "output_name": "primitive_drawing"
-        }
+        return self.execute_batch([
+            ("primitive", {
+                "primitive_type": primitive_type,
+                "location": {"x": location[0], "y": location[1], "z": location[2]},
+                "scale": {"x": scale[0], "y": scale[1], "z": scale[2]},
+                "rotation": {"x": 0, "y": 0, "z": 0},
+                "color": color_obj,
+                "name": name
+            })
+        ], output_name="primitive_drawing")
+    
+    @staticmethod
+    def parse_coordinates(coordinates: Union[str, List[Dict[str, float]]]) -> Tuple[Optional[np.ndarray], Optional[str]]:
+        """
+        Parse custom mesh coordinates into an (N, 3) float array.
         
-        return self.execute_drawing_session(session_data)
+        Args:
+            coordinates: "X Y Z" lines, or a list of {"x", "y", "z"} points (missing axes default to 0)
+            
+        Returns:
+            Tuple of (coordinates, error_message)
+        """
+        if isinstance(coordinates, list):
+            try:
+                coords = np.array(
+                    [(float(p.get('x', 0)), float(p.get('y', 0)), float(p.get('z', 0))) for p in coordinates],
+                    dtype=np.float64
+                ).reshape(-1, 3)
+            except (AttributeError, TypeError, ValueError):
+                return None, "Invalid coordinates format"
+            if len(coords) < 3:
+                return None, f"At least 3 coordinate points are required, got {len(coords)}"
+            return coords, None
+        
+        # Fast path: tokenize and convert everything in C, then validate the shape once
+        if coordinates.strip():
+            try:
+                coords = np.loadtxt(io.StringIO(coordinates), dtype=np.float64, ndmin=2, comments=None)
+                if coords.shape[1] == 3 and coords.shape[0] >= 3:
+                    return coords, None
+            except ValueError:
+                pass
+        
+        # Slow path: walk the lines only to report which one is invalid
+        lines = [line.strip() for line in coordinates.split('\n') if line.strip()]
+        if len(lines) < 3:
+            return None, f"At least 3 coordinate points are required, got {len(lines)}"
+        
+        for i, line in enumerate(lines):
+            parts = line.split()
+            if len(parts) != 3:
+                return None, f"Invalid coordinate format at line {i+1}: '{line}'. Expected 'X Y Z'"
+            try:
+                [float(p) for p in parts]
+            except ValueError:
+                return None, f"Invalid numeric values at line {i+1}: '{line}'"
+        
+        return None, "Invalid coordinates"
+    
+    @staticmethod
+    def pack_floats(values: np.ndarray) -> str:
+        """Encode numbers as base64 little-endian float64, about half the size of JSON text and parsed by memcpy."""
+        return base64.b64encode(np.ascontiguousarray(values, dtype="<f8").tobytes()).decode("ascii")
     
     def create_custom_mesh_from_coords(self, coordinates_text: str, color: str = "#cccccc", 
                                      name: str = "CustomMesh", use_convex_hull: bool = True) -> Tuple[bool, Optional[str], Optional[str]]:
         """Create a custom mesh from text coordinates."""
         try:
             # Validate and parse coordinates
-            lines = [line.strip() for line in coordinates_text.split('\n') if line.strip()]
-            if len(lines) < 3:
-                return False, None, f"At least 3 coordinate points required, got {len(lines)}"
-            
-            # Validate coordinate format
-            parsed_points = []
-            for i, line in enumerate(lines):
-                parts = line.split()
-                if len(parts) != 3:
-                    return False, None, f"Invalid coordinate format at line {i+1}: '{line}'"
-                try:
-                    x, y, z = [float(p) for p in parts]
-                    parsed_points.append({"x": x, "y": y, "z": z})
-                except ValueError:
-                    return False, None, f"Invalid numeric values at line {i+1}: '{line}'"
+            coords, error = self.parse_coordinates(coordinates_text)
+            if error:
+                return False, None, error
             
             color_obj = self._convert_hex_to_rgba(color)
             
-            session_data = {
-                "session_id": str(uuid.uuid4()),
-                "clear_scene": True,
-                "commands": [
-                    ("custom_coords", {
-                        "coordinates_text": coordinates_text,
-                        "coordinates_points": parsed_points,  # Also send parsed points
-                        "color": color_obj,
-                        "name": name,
-                        "use_convex_hull": use_convex_hull
-                    })
-                ],
-                "output_format": "obj",
-                "output_name": f"custom_mesh_{name.lower().replace(' ', '_')}"
-            }
-            
-            return self.execute_drawing_session(session_data)
+            return self.execute_batch([
+                ("custom_coords", {
+                    "points_f64": self.pack_floats(coords),  # Already validated, Blender skips re-parsing
+                    "color": color_obj,
+                    "name": name,
+                    "use_convex_hull": use_convex_hull
+                })
+            ], output_name=f"custom_mesh_{name.lower().replace(' ', '_')}")
             
         except Exception as e:
             return False, None, f"Error processing coordinates: {str(e)}"
     
-    def update_model(self, original_obj_path: str, updates: Dict[str, Any], output_name: Optional[str] = None) -> Tuple[bool, Optional[str], Optional[str]]:
+    @staticmethod
+    def _vec3(value: Any, default: float) -> Optional[np.ndarray]:
+        """Read an [x, y, z] list or {"x", "y", "z"} dict as a float64 vector; None for other formats."""
+        if isinstance(value, list) and len(value) >= 3:
+            return np.asarray(value[:3], dtype=np.float64)
+        if isinstance(value, dict):
+            return np.asarray([value.get("x", default), value.get("y", default), value.get("z", default)],
+                              dtype=np.float64)
+        return None
+    
+    def _build_blender_updates(self, updates: Dict[str, Any], obj_name: str) -> Dict[str, Any]:
         """
-        Update an existing OBJ model with new transforms and material properties.
+        Convert an update request into the normalized spec consumed by the update script.
         
         Args:
-            original_obj_path: Path to the original .obj file
             updates: Dictionary with update specifications
-            output_name: Optional name for output file
+            obj_name: Name of the object being updated
             
         Returns:
-            Tuple of (success, output_path, error_message)
+            Update specification with location/rotation (radians)/scale lists and material values
         """
-        try:
-            import tempfile
-            from pathlib import Path
-            import math
+        blender_updates = {"object": obj_name}
+        
+        # Handle position/location - support both array and object formats
+        location = self._vec3(updates.get("position", updates.get("location")), 0.0)
+        if location is not None:
+            blender_updates["location"] = location.tolist()
+        
+        # Handle rotation - support both array and object formats, convert to radians
+        rotation = self._vec3(updates.get("rotation"), 0.0)
+        if rotation is not None:
+            blender_updates["rotation"] = np.deg2rad(rotation).tolist()
+        
+        # Handle scale - support both array and object formats
+        scale = self._vec3(updates.get("scale"), 1.0)
+        if scale is not None:
+            blender_updates["scale"] = scale.tolist()
+        
+        # Handle material properties
+        if "material" in updates:
+            mat = updates["material"]
+            material_spec = {}
             
-            # Validate original file exists
-            if not os.path.exists(original_obj_path):
-                return False, None, f"Original OBJ file not found: {original_obj_path}"
+            if "color" in mat:
+                color = mat["color"]
+                if isinstance(color, str):  # Handle hex color format
+                    color_obj = self._convert_hex_to_rgba(color)
+                    material_spec["color"] = list(color_obj)
+                elif isinstance(color, list) and len(color) >= 3:  # Handle array format
+                    material_spec["color"] = [
+                        float(color[0]), 
+                        float(color[1]), 
+                        float(color[2]), 
+                        float(color[3]) if len(color) > 3 else 1.0
+                    ]
             
-            # Generate output name if not provided
-            if not output_name:
-                original_name = Path(original_obj_path).stem
-                timestamp = str(uuid.uuid4())[:8]
-                output_name = f"{original_name}_edited_{timestamp}"
+            if "roughness" in mat:
+                material_spec["roughness"] = float(mat["roughness"])
+                
+            # Handle both "metallic" and "metalness"
+            if "metallic" in mat:
+                material_spec["metallic"] = float(mat["metallic"])
+            elif "metalness" in mat:
+                material_spec["metallic"] = float(mat["metalness"])
             
-            # Prepare output directory
-            output_dir = Path(__file__).parent / "output" / "drawings"
-            output_dir.mkdir(parents=True, exist_ok=True)
-            output_path = output_dir / f"{output_name}.obj"
+            # Handle emission/emissive
+            emission_color = None
+            if "emission" in mat:
+                emission = mat["emission"]
+                if isinstance(emission, str):  # Handle hex format
+                    emission_obj = self._convert_hex_to_rgba(emission)
+                    emission_color = list(emission_obj[:3])
+                elif isinstance(emission, list) and len(emission) >= 3:  # Handle array format
+                    emission_color = [float(emission[0]), float(emission[1]), float(emission[2])]
+            elif "emissive" in mat:
+                emissive = mat["emissive"]
+                if isinstance(emissive, str):  # Handle hex format
+                    emissive_obj = self._convert_hex_to_rgba(emissive)
+                    emission_color = list(emissive_obj[:3])
+                elif isinstance(emissive, list) and len(emissive) >= 3:  # Handle array format
+                    emission_color = [float(emissive[0]), float(emissive[1]), float(emissive[2])]
             
-            # Create temp directory for script execution
-            with tempfile.TemporaryDirectory() as temp_dir:
-                temp_path = Path(temp_dir)
-                
-                # Create update specification file
-                update_file = temp_path / "update_spec.json"
-                script_file = temp_path / "update_script.py"
-                result_file = temp_path / "result.json"
-                
-                # Prepare the update specification with object name
-                obj_name = Path(original_obj_path).stem
-                
-                # Convert updates dictionary to Blender-compatible format
-                blender_updates = {"object": obj_name}
-                
-                # Handle position/location - support both array and object formats
-                if "position" in updates:
-                    pos = updates["position"]
-                    if isinstance(pos, list) and len(pos) >= 3:
-                        blender_updates["location"] = [float(pos[0]), float(pos[1]), float(pos[2])]
-                    elif isinstance(pos, dict):
-                        blender_updates["location"] = [
-                            float(pos.get("x", 0)), 
-                            float(pos.get("y", 0)), 
-                            float(pos.get("z", 0))
-                        ]
-                elif "location" in updates:
-                    loc = updates["location"]
-                    if isinstance(loc, list) and len(loc) >= 3:
-                        blender_updates["location"] = [float(loc[0]), float(loc[1]), float(loc[2])]
-                    elif isinstance(loc, dict):
-                        blender_updates["location"] = [
-                            float(loc.get("x", 0)), 
-                            float(loc.get("y", 0)), 
-                            float(loc.get("z", 0))
-                        ]
-                
-                # Handle rotation - support both array and object formats, convert to radians
-                if "rotation" in updates:
-                    rot = updates["rotation"]
-                    if isinstance(rot, list) and len(rot) >= 3:
-                        blender_updates["rotation"] = [
-                            math.radians(float(rot[0])),
-                            math.radians(float(rot[1])),
-                            math.radians(float(rot[2]))
-                        ]
-                    elif isinstance(rot, dict):
-                        blender_updates["rotation"] = [
-                            math.radians(float(rot.get("x", 0))),
-                            math.radians(float(rot.get("y", 0))),
-                            math.radians(float(rot.get("z", 0)))
-                        ]
-                
-                # Handle scale - support both array and object formats
-                if "scale" in updates:
-                    scale = updates["scale"]
-                    if isinstance(scale, list) and len(scale) >= 3:
-                        blender_updates["scale"] = [float(scale[0]), float(scale[1]), float(scale[2])]
-                    elif isinstance(scale, dict):
-                        blender_updates["scale"] = [
-                            float(scale.get("x", 1)), 
-                            float(scale.get("y", 1)), 
-                            float(scale.get("z", 1))
-                        ]
-                
-                # Handle material properties
-                if "material" in updates:
-                    mat = updates["material"]
-                    material_spec = {}
-                    
-                    if "color" in mat:
-                        color = mat["color"]
-                        if isinstance(color, str):  # Handle hex color format
-                            color_obj = self._convert_hex_to_rgba(color)
-                            material_spec["color"] = [color_obj["r"], color_obj["g"], color_obj["b"], color_obj["a"]]
-                        elif isinstance(color, list) and len(color) >= 3:  # Handle array format
-                            material_spec["color"] = [
-                                float(color[0]), 
-                                float(color[1]), 
-                                float(color[2]), 
-                                float(color[3]) if len(color) > 3 else 1.0
-                            ]
-                    
-                    if "roughness" in mat:
-                        material_spec["roughness"] = float(mat["roughness"])
-                        
-                    # Handle both "metallic" and "metalness"
-                    if "metallic" in mat:
-                        material_spec["metallic"] = float(mat["metallic"])
-                    elif "metalness" in mat:
-                        material_spec["metallic"] = float(mat["metalness"])
-                    
-                    # Handle emission/emissive
-                    emission_color = None
-                    if "emission" in mat:
-                        emission = mat["emission"]
-                        if isinstance(emission, str):  # Handle hex format
-                            emission_obj = self._convert_hex_to_rgba(emission)
-                            emission_color = [emission_obj["r"], emission_obj["g"], emission_obj["b"]]
-                        elif isinstance(emission, list) and len(emission) >= 3:  # Handle array format
-                            emission_color = [float(emission[0]), float(emission[1]), float(emission[2])]
-                    elif "emissive" in mat:
-                        emissive = mat["emissive"]
-                        if isinstance(emissive, str):  # Handle hex format
-                            emissive_obj = self._convert_hex_to_rgba(emissive)
-                            emission_color = [emissive_obj["r"], emissive_obj["g"], emissive_obj["b"]]
-                        elif isinstance(emissive, list) and len(emissive) >= 3:  # Handle array format
-                            emission_color = [float(emissive[0]), float(emissive[1]), float(emissive[2])]
-                    
-                    if emission_color:
-                        material_spec["emission"] = emission_color
-                    
-                    if "emissiveIntensity" in mat:
-                        material_spec["emissiveIntensity"] = float(mat["emissiveIntensity"])
-                    
-                    # NEW: Handle texture information
-                    if "textureId" in mat and mat["textureId"]:
-                        material_spec["textureId"] = str(mat["textureId"])
-                        
-                    if "textureScale" in mat:
-                        material_spec["textureScale"] = float(mat["textureScale"])
-                    
-                    if material_spec:
-                        blender_updates["material"] = material_spec
-                
-                # Write update specification to file
-                with open(update_file, "w") as f:
-                    json.dump(blender_updates, f, indent=2)
-                
-                print(f"Blender update spec: {json.dumps(blender_updates, indent=2)}")
-                
-                # Create Blender script for updating
-                script_content = self._create_update_script(
-                    str(update_file), 
-                    original_obj_path, 
-                    str(output_path)
-                )
-                
-                with open(script_file, "w", encoding='utf-8') as f:
-                    f.write(script_content)
-                
-                # Execute Blender command
-                cmd = [
-                    self.blender_executable,
-                    "--background",
-                    "--python", str(script_file),
-                    "--", 
-                    "--input", str(update_file),
-                    "--obj", original_obj_path,
-                    "--output", str(output_path)
-                ]
-                
-                print(f"Executing Blender update command: {' '.join(cmd)}")
+            if emission_color:
+                material_spec["emission"] = emission_color
+            
+            if "emissiveIntensity" in mat:
+                material_spec["emissiveIntensity"] = float(mat["emissiveIntensity"])
+            
+            # NEW: Handle texture information
+            if "textureId" in mat and mat["textureId"]:
+                material_spec["textureId"] = str(mat["textureId"])
                 
-                try:
-                    result = subprocess.run(
-                        cmd, 
-                        capture_output=True, 
-                        text=True, 
-                        timeout=self.timeout,
-                        cwd=str(Path(__file__).parent)
-                    )
-                    
-                    print(f"Blender update stdout: {result.stdout}")
-                    if result.stderr:
-                        print(f"Blender update stderr: {result.stderr}")
-                    
-                    if result.returncode != 0:
-                        return False, None, f"Blender update failed with code {result.returncode}: {result.stderr}"
-                    
-                    # Check if output file was created
-                    if output_path.exists():
-                        print(f"✓ Output file created at: {output_path}")
-                        print(f"✓ Output file size: {output_path.stat().st_size} bytes")
-                        
-                        # Read and log a few lines of the created file for debugging
-                        try:
-                            with open(output_path, 'r') as f:
-                                lines = f.readlines()[:15]  # First 15 lines
-                            print("✓ Output file content preview:")
-                            for i, line in enumerate(lines):
-                                print(f"  {i+1}: {line.rstrip()}")
-                        except Exception as e:
-                            print(f"✗ Could not read output file: {e}")
-                        
-                        return True, str(output_path), None
-                    else:
-                        return False, None, "Output file was not created"
-                        
-                except subprocess.TimeoutExpired:
-                    return False, None, "Blender update timed out"
-                except Exception as e:
-                    return False, None, f"Execution error: {str(e)}"
-                    
-        except Exception as e:
-            import traceback
-            tb = traceback.format_exc()
-            return False, None, f"Error updating model: {str(e)}\n{tb}"
+            if "textureScale" in mat:
+                material_spec["textureScale"] = float(mat["textureScale"])
+            
+            if material_spec:
+                blender_updates["material"] = material_spec
+        
+        return blender_updates
     
-    def _create_update_script(self, update_file: str, obj_path: str, output_path: str) -> str:
-        """Create Python script for Blender model update execution."""
-        return f'''
-import bpy
-import sys
-import json
-import os
-import math
-from pathlib import Path
-import logging
-from mathutils import Vector, Euler, Matrix
-import bmesh
-
-# Setup logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-logger = logging.getLogger(__name__)
-
-logger.info("Starting Blender model update script")
-
-def parse_args():
-    """Parse command line arguments"""
-    import argparse
-    parser = argparse.ArgumentParser(description="Update object transforms & material")
-    parser.add_argument("--input", type=str, required=True, help="Path to JSON file with update spec")
-    parser.add_argument("--obj", type=str, required=True, help="Path to OBJ file to update")
-    parser.add_argument("--output", type=str, required=True, help="Path to save updated OBJ")
-    return parser.parse_args(sys.argv[sys.argv.index("--")+1:])
-
-def load_obj(filepath):
-    """Import OBJ file using Blender 4.4+ API"""
-    logger.info(f"Importing OBJ: {{filepath}}")
-    # First clear any existing objects
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete()
-    
-    # Import OBJ file using new Blender 4.4+ operator
-    bpy.ops.wm.obj_import(filepath=filepath)
-    
-    # Return the imported object
-    if len(bpy.context.selected_objects) > 0:
-        obj = bpy.context.selected_objects[0]
-        logger.info(f"Imported object: {{obj.name}}")
-        
-        # Set object as active
-        bpy.context.view_layer.objects.active = obj
-        obj.select_set(True)
-        
-        # Log original vertex positions
-        logger.info("Original imported vertex positions:")
-        for i, vert in enumerate(obj.data.vertices[:8]):
-            logger.info(f"  Original Vertex {{i}}: {{vert.co[0]:.6f}}, {{vert.co[1]:.6f}}, {{vert.co[2]:.6f}}")
-        
-        return obj
-    else:
-        logger.error("No objects were imported")
+    @staticmethod
+    def _compose_transform(blender_updates: Dict[str, Any]) -> np.ndarray:
+        """
+        Build the 4x4 matrix applied by the update script (translation @ rotation @ scale).
+        
+        Rotation follows Blender's XYZ Euler convention, i.e. Rz @ Ry @ Rx.
+        """
+        sx, sy, sz = blender_updates.get("scale", (1.0, 1.0, 1.0))
+        rx, ry, rz = blender_updates.get("rotation", (0.0, 0.0, 0.0))
+        tx, ty, tz = blender_updates.get("location", (0.0, 0.0, 0.0))
+        
+        cx, cy, cz = math.cos(rx), math.cos(ry), math.cos(rz)
+        snx, sny, snz = math.sin(rx), math.sin(ry), math.sin(rz)
+        
+        # Closed form of Rz @ Ry @ Rx with the scale folded into the columns, like
+        # mathutils.Matrix.LocRotScale: one 4x4 build, no intermediate products
+        return np.array([
+            [cy * cz * sx, (snx * sny * cz - cx * snz) * sy, (cx * sny * cz + snx * snz) * sz, tx],
+            [cy * snz * sx, (snx * sny * snz + cx * cz) * sy, (cx * sny * snz - snx * cz) * sz, ty],
+            [-sny * sx, snx * cy * sy, cx * cy * sz, tz],
+            [0.0, 0.0, 0.0, 1.0],
+        ])
+    
+    def _fast_obj_transform(self, original_obj_path: str, matrix: np.ndarray,
+                            output_path: Path) -> Tuple[bool, Optional[str], Optional[str]]:
+        """
+        Apply a transform-only update in pure Python, without launching Blender.
+        
+        Vertices are multiplied by the matrix and normals by its inverse transpose;
+        every other OBJ statement is copied unchanged. The source MTL is copied next
+        to the output and the mtllib reference updated to point at it.
+        
+        Args:
+            original_obj_path: Path to the original .obj file
+            matrix: 4x4 transform from _compose_transform
+            output_path: Path of the updated .obj file
+            
+        Returns:
+            Tuple of (success, output_path, error_message)
+        """
+        source_obj = Path(original_obj_path)
+        output_mtl = output_path.with_suffix(".mtl")
+        source_mtl = None
+        linear = matrix[:3, :3]
+        # Normals transform by the inverse transpose. The rows of the cofactor matrix give the
+        # same directions up to the sign of the determinant and stay defined for a zero scale,
+        # where the mesh is flattened and its normals collapse onto the remaining axis (or to 0).
+        columns = linear.T
+        cofactors = np.array([np.cross(columns[1], columns[2]),
+                              np.cross(columns[2], columns[0]),
+                              np.cross(columns[0], columns[1])])
+        normal_matrix = np.copysign(1.0, np.linalg.det(linear)) * cofactors
+        # A pure translation leaves normals unchanged, so vn lines are copied without parsing
+        vn_prefix = None if np.array_equal(linear, np.identity(3)) else "vn "
+        
+        # Consecutive v (or vn) lines are transformed in small batches and written
+        # as soon as the batch is full or the run ends, so the file is never held in memory
+        batch_kind = None
+        batch_rows = []
+        
+        def flush(dst):
+            nonlocal batch_kind
+            if not batch_rows:
+                return
+            coords = np.array([row[1:4] for row in batch_rows], dtype=np.float64)
+            if batch_kind == "v":
+                coords = coords @ linear.T + matrix[:3, 3]
+                for row, (x, y, z) in zip(batch_rows, coords):
+                    # Keep any trailing per-vertex values (e.g. vertex colors) as they are
+                    extra = "".join(f" {value}" for value in row[4:])
+                    dst.write(f"v {x:.6f} {y:.6f} {z:.6f}{extra}\n")
+            else:
+                coords = coords @ normal_matrix
+                lengths = np.linalg.norm(coords, axis=1, keepdims=True)
+                coords /= np.where(lengths > 0.0, lengths, 1.0)
+                for x, y, z in coords:
+                    dst.write(f"vn {x:.4f} {y:.4f} {z:.4f}\n")
+            batch_rows.clear()
+            batch_kind = None
+        
+        with open(source_obj, "r") as src, open(output_path, "w") as dst:
+            for line in src:
+                kind = "v" if line.startswith("v ") else "vn" if vn_prefix and line.startswith(vn_prefix) else None
+                if kind != batch_kind or len(batch_rows) >= self.TRANSFORM_BATCH_SIZE:
+                    flush(dst)
+                if kind:
+                    batch_kind = kind
+                    batch_rows.append(line.split())
+                elif line.startswith("mtllib "):
+                    source_mtl = source_mtl or source_obj.parent / line[7:].strip()
+                    dst.write(f"mtllib {output_mtl.name}\n")
+                else:
+                    dst.write(line)
+            flush(dst)
+        
+        if source_mtl and source_mtl.exists():
+            shutil.copyfile(source_mtl, output_mtl)
+        
+        if self.debug:
+            print(f"✓ Transform-only update written without Blender: {output_path}")
+        return True, str(output_path), None
+    
+    @staticmethod
+    def _update_cache_key(original_obj_path: str, blender_updates: Dict[str, Any]) -> bytes:
+        """
+        Key identifying an update by the contents of its source files and its normalized spec.
+        
+        Hashing the contents instead of path and mtime lets copies of a model and re-saved but
+        unchanged files share results. The MTL files the OBJ references are part of the source:
+        every update path copies or patches them into its output.
+        """
+        source_obj = Path(original_obj_path)
+        digest = hashlib.blake2b(digest_size=16)
+        mtl_names = []
+        with open(source_obj, "rb") as f:
+            for line in f:
+                digest.update(line)
+                if line.startswith(b"mtllib "):
+                    mtl_names.append(os.fsdecode(line[7:].strip()))
+        for mtl_name in mtl_names:
+            mtl_path = source_obj.parent / mtl_name
+            # Fixed-size digests keep the MTL contents from running into the spec bytes
+            mtl_bytes = mtl_path.read_bytes() if mtl_path.is_file() else b""
+            digest.update(hashlib.blake2b(mtl_bytes, digest_size=16).digest())
+        digest.update(_json_dumps(blender_updates))
+        return digest.digest()
+    
+    def _cached_update(self, cache_key: bytes) -> Optional[str]:
+        """Return the output of a cached update if its file still exists, marking it recently used."""
+        with self._update_cache_lock:
+            cached_path = self._update_cache.pop(cache_key, None)
+            if cached_path and os.path.exists(cached_path):
+                # Re-inserting keeps recently used results last, away from eviction
+                self._update_cache[cache_key] = cached_path
+                return cached_path
         return None
-
-def apply_updates(obj, spec):
-    """Apply updates to object using direct mesh vertex manipulation"""
-    logger.info(f"Applying updates to object: {{obj.name}}")
-    
-    # Make sure object is selected and active
-    bpy.context.view_layer.objects.active = obj
-    obj.select_set(True)
-    
-    # Reset object transforms to ensure clean state
-    obj.location = (0, 0, 0)
-    obj.rotation_euler = (0, 0, 0)
-    obj.scale = (1, 1, 1)
-    obj.rotation_mode = 'XYZ'
-    
-    # Force update
-    bpy.context.view_layer.update()
-    
-    # Apply transformations directly to mesh vertices
-    if any(key in spec for key in ["location", "rotation", "scale"]):
-        logger.info("Applying transformations directly to mesh vertices...")
-        
-        # Get mesh data
-        mesh = obj.data
-        
-        # Create transformation matrices
-        scale_matrix = Matrix.Identity(4)
-        rotation_matrix = Matrix.Identity(4)
-        translation_matrix = Matrix.Identity(4)
-        
-        # Build scale matrix
-        if "scale" in spec:
-            scale = spec["scale"]
-            scale_matrix = Matrix.Scale(scale[0], 4, (1, 0, 0)) @ Matrix.Scale(scale[1], 4, (0, 1, 0)) @ Matrix.Scale(scale[2], 4, (0, 0, 1))
-            logger.info(f"Scale matrix: {{scale}}")
-        
-        # Build rotation matrix
-        if "rotation" in spec:
-            rotation = spec["rotation"]
-            # Apply rotations in correct order: Z, Y, X (Euler XYZ)
-            euler = Euler((rotation[0], rotation[1], rotation[2]), 'XYZ')
-            rotation_matrix = euler.to_matrix().to_4x4()
-            logger.info(f"Rotation: {{[math.degrees(r) for r in rotation]}} degrees")
-        
-        # Build translation matrix
-        if "location" in spec:
-            location = spec["location"]
-            translation_matrix = Matrix.Translation((location[0], location[1], location[2]))
-            logger.info(f"Translation: {{location}}")
-        
-        # FIXED: Combine transformations in correct order: Scale -> Rotate -> Translate
-        # But apply them in reverse order to the vertex positions
-        transform_matrix = translation_matrix @ rotation_matrix @ scale_matrix
-        
-        logger.info("Applying transformations step by step to vertices...")
-        
-        # Apply transformations step by step for better control
-        temp_vertices = []
-        
-        # First collect all vertex positions
-        for vert in mesh.vertices:
-            temp_vertices.append(Vector((vert.co.x, vert.co.y, vert.co.z)))
-        
-        # Apply scale first
-        if "scale" in spec:
-            scale = spec["scale"]
-            for i, vert_co in enumerate(temp_vertices):
-                temp_vertices[i] = Vector((
-                    vert_co.x * scale[0],
-                    vert_co.y * scale[1], 
-                    vert_co.z * scale[2]
-                ))
-            logger.info(f"Applied scale: {{scale}}")
-        
-        # Apply rotation second
-        if "rotation" in spec:
-            rotation = spec["rotation"]
-            # Create rotation matrix
-            rot_x = Matrix.Rotation(rotation[0], 3, 'X').to_4x4()
-            rot_y = Matrix.Rotation(rotation[1], 3, 'Y').to_4x4()
-            rot_z = Matrix.Rotation(rotation[2], 3, 'Z').to_4x4()
-            
-            # Apply rotations in order: X, then Y, then Z
-            combined_rotation = rot_z @ rot_y @ rot_x
-            
-            for i, vert_co in enumerate(temp_vertices):
-                vert_co_4d = Vector((vert_co.x, vert_co.y, vert_co.z, 1.0))
-                rotated = combined_rotation @ vert_co_4d
-                temp_vertices[i] = Vector((rotated.x, rotated.y, rotated.z))
-            logger.info(f"Applied rotation: {{[math.degrees(r) for r in rotation]}} degrees")
-        
-        # Apply translation last
-        if "location" in spec:
-            location = spec["location"]
-            for i, vert_co in enumerate(temp_vertices):
-                temp_vertices[i] = Vector((
-                    vert_co.x + location[0],
-                    vert_co.y + location[1],
-                    vert_co.z + location[2]
-                ))
-            logger.info(f"Applied translation: {{location}}")
-        
-        # Now update the actual mesh vertices
-        for i, vert in enumerate(mesh.vertices):
-            vert.co = temp_vertices[i]
-    
-    # Handle material updates
-    if "material" in spec:
-        logger.info("Applying material updates...")
-        
-        # Get or create material
-        if obj.data.materials:
-            mat = obj.data.materials[0]
-        else:
-            mat = bpy.data.materials.new(name=f"{{obj.name}}_material")
-            obj.data.materials.append(mat)
+    
+    def _remember_update(self, cache_key: bytes,
+                         result: Tuple[bool, Optional[str], Optional[str]]) -> Tuple[bool, Optional[str], Optional[str]]:
+        """Store a successful update result in the cache and pass the result through."""
+        success, output_path, _ = result
+        if success:
+            with self._update_cache_lock:
+                if len(self._update_cache) >= self.UPDATE_CACHE_SIZE:
+                    # Dicts keep insertion order, so the first key not in use is the oldest
+                    # evictable one. Keys being computed or published are skipped, and the
+                    # cache runs over its size until they finish.
+                    evicted_key = next((key for key in self._update_cache if key not in self._update_inflight), None)
+                    if evicted_key is not None:
+                        evicted = Path(self._update_cache.pop(evicted_key))
+                        # Outputs are named by their cache key, so nothing else refers to an evicted one.
+                        # Deleting under the lock keeps a new request for the key from racing the unlink.
+                        for stale in (evicted, evicted.with_suffix(".mtl")):
+                            stale.unlink(missing_ok=True)
+                self._update_cache[cache_key] = output_path
+        return result
+    
+    def _publish_update(self, result_path: str, destination: Path) -> None:
+        """
+        Copy an update result to destination.
+        
+        The MTL is copied next to it under the same stem, along with textures the MTL references
+        from the result's folder that the destination folder does not have yet.
+        """
+        source = Path(result_path)
+        shutil.copy2(source, destination)
+        source_mtl = source.with_suffix(".mtl")
+        if not source_mtl.exists():
+            return
+        shutil.copy2(source_mtl, destination.with_suffix(".mtl"))
+        # A missing texture leaves the model untextured rather than failing the update
+        try:
+            for texture_ref in re.findall(r"map_\w+\s+(\S+)", source_mtl.read_text(errors="replace")):
+                texture_source = source.parent / texture_ref
+                texture_dest = destination.parent / texture_ref
+                if texture_source.is_file() and not texture_dest.exists():
+                    shutil.copy2(texture_source, texture_dest)
+                elif self.debug and not texture_source.is_file():
+                    print(f"Texture file not found: {texture_source}")
+        except OSError as e:
+            print(f"Error copying texture files: {e}")
+    
+    def _fast_material_update(self, original_obj_path: str, material_spec: Dict[str, Any],
+                              output_path: Path) -> Tuple[bool, Optional[str], Optional[str]]:
+        """
+        Apply a material-only update in pure Python, without launching Blender.
         
-        # Enable nodes for material
-        mat.use_nodes = True
-        nodes = mat.node_tree.nodes
-        links = mat.node_tree.links
+        The OBJ is copied with its mtllib reference pointed at a new MTL file, which
+        holds the original materials with the first used one patched.
         
-        # Clear existing nodes
-        nodes.clear()
+        Args:
+            original_obj_path: Path to the original .obj file
+            material_spec: Normalized material spec from _build_blender_updates
+            output_path: Path of the updated .obj file
+            
+        Returns:
+            Tuple of (success, output_path, error_message)
+        """
+        source_obj = Path(original_obj_path)
+        output_mtl = output_path.with_suffix(".mtl")
+        source_mtl = None
+        used_material = None
         
-        # Create Principled BSDF
-        bsdf = nodes.new(type='ShaderNodeBsdfPrincipled')
+        # Stream the OBJ, redirecting it to the new MTL file
+        with open(source_obj, "r") as src, open(output_path, "w") as dst:
+            dst.write(f"mtllib {output_mtl.name}\n")
+            for line in src:
+                if line.startswith("mtllib "):
+                    source_mtl = source_mtl or source_obj.parent / line[7:].strip()
+                    continue
+                if line.startswith("usemtl "):
+                    used_material = used_material or line[7:].strip()
+                elif line.startswith("f ") and used_material is None:
+                    used_material = f"{source_obj.stem}_material"
+                    dst.write(f"usemtl {used_material}\n")
+                dst.write(line)
         
-        # Create Material Output
-        material_output = nodes.new(type='ShaderNodeOutputMaterial')
+        # Split the original MTL into a header and one block per material
+        header, blocks = [], []
+        if source_mtl and source_mtl.exists():
+            with open(source_mtl, "r") as f:
+                for line in f:
+                    if line.startswith("newmtl "):
+                        blocks.append([line])
+                    elif blocks:
+                        blocks[-1].append(line)
+                    else:
+                        header.append(line)
         
-        # Link BSDF to output
-        links.new(bsdf.outputs['BSDF'], material_output.inputs['Surface'])
+        used_material = used_material or "DefaultMaterial"
+        target = next((b for b in blocks if b[0][7:].strip() == used_material), None)
+        if target is None and blocks:
+            target = blocks[0]
+        elif target is None:
+            target = [
+                f"newmtl {used_material}\n",
+                "Ns 90.000000\n",
+                "Ka 0.100000 0.100000 0.100000\n",
+                "Kd 0.800000 0.800000 0.800000\n",
+                "Ks 0.500000 0.500000 0.500000\n",
+                "Ke 0.000000 0.000000 0.000000\n",
+                "Ni 1.500000\n",
+                "d 1.000000\n",
+                "illum 3\n",
+                "\n"
+            ]
+            blocks.append(target)
+        target[:] = self._patch_mtl_block(target, material_spec)
         
-        material_spec = spec["material"]
+        with open(output_mtl, "w") as f:
+            f.writelines(header)
+            for block in blocks:
+                f.writelines(block)
         
-        # Apply color
+        if self.debug:
+            print(f"✓ Material-only update written without Blender: {output_path}")
+        return True, str(output_path), None
+    
+    @staticmethod
+    def _patch_mtl_block(block: list, material_spec: Dict[str, Any]) -> list:
+        """Replace (or add) the Kd/Ns/Ke/d statements of an MTL material block."""
+        values = {}
         if "color" in material_spec:
-            color = material_spec["color"]
-            bsdf.inputs["Base Color"].default_value = (color[0], color[1], color[2], color[3])
-            # Also set legacy diffuse color for OBJ export
-            mat.diffuse_color = (color[0], color[1], color[2], color[3])
-            logger.info(f"Applied base color: {{color}}")
-        
-        # Apply roughness
+            r, g, b, a = material_spec["color"]
+            values["Kd"] = f"Kd {r:.6f} {g:.6f} {b:.6f}\n"
+            values["d"] = f"d {a:.6f}\n"
         if "roughness" in material_spec:
-            roughness = material_spec["roughness"]
-            bsdf.inputs["Roughness"].default_value = roughness
-            logger.info(f"Applied roughness: {{roughness}}")
+            # Same roughness -> specular exponent mapping as Blender's OBJ exporter
+            values["Ns"] = f"Ns {(1.0 - material_spec['roughness']) ** 2 * 1000.0:.6f}\n"
+        if "emission" in material_spec:
+            strength = material_spec.get("emissiveIntensity", 1.0)
+            r, g, b = (c * strength for c in material_spec["emission"])
+            values["Ke"] = f"Ke {r:.6f} {g:.6f} {b:.6f}\n"
         
-        # Apply metallic
-        if "metallic" in material_spec:
-            metallic = material_spec["metallic"]
-            bsdf.inputs["Metallic"].default_value = metallic
-            logger.info(f"Applied metallic: {{metallic}}")
+        patched = [block[0]]
+        for line in block[1:]:
+            parts = line.split(maxsplit=1)
+            patched.append(values.pop(parts[0], line) if parts else line)
         
-        # Apply emission
-        if "emission" in material_spec:
-            emission = material_spec["emission"]
-            if "Emission Color" in bsdf.inputs:
-                bsdf.inputs["Emission Color"].default_value = (emission[0], emission[1], emission[2], 1.0)
-            elif "Emission" in bsdf.inputs:
-                bsdf.inputs["Emission"].default_value = (emission[0], emission[1], emission[2], 1.0)
-            logger.info(f"Applied emission: {{emission}}")
-        
-        # Apply emission strength/intensity
-        if "emissiveIntensity" in material_spec:
-            intensity = material_spec["emissiveIntensity"]
-            if "Emission Strength" in bsdf.inputs:
-                bsdf.inputs["Emission Strength"].default_value = intensity
-            logger.info(f"Applied emission intensity: {{intensity}}")
-
-def export_obj(filepath):
-    """Export scene to OBJ using manual method for precise control"""
-    logger.info(f"Exporting to OBJ: {{filepath}}")
-    # Ensure output directory exists
-    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-    
-    # Get the mesh object
-    mesh_obj = None
-    for obj in bpy.context.scene.objects:
-        if obj.type == 'MESH':
-            mesh_obj = obj
-            break
-    
-    if not mesh_obj:
-        logger.error("No mesh object found for export")
-        return
-    
-    # Log vertex positions before export
-    logger.info("Final vertex positions before export:")
-    for i, vert in enumerate(mesh_obj.data.vertices[:8]):
-        logger.info(f"  Export Vertex {{i}}: {{vert.co[0]:.6f}}, {{vert.co[1]:.6f}}, {{vert.co[2]:.6f}}")
-    
-    # Manual export to ensure correct vertex coordinates and faces
-    try:
-        with open(filepath, 'w') as f:
-            # Write header
-            f.write("# Blender 4.4.3\\n")
-            f.write("# www.blender.org\\n")
-            mtl_name = os.path.basename(filepath).replace('.obj', '.mtl')
-            f.write(f"mtllib {{mtl_name}}\\n")
-            f.write(f"o {{mesh_obj.name}}\\n")
-            
-            # Write vertices using actual mesh coordinates
-            for vert in mesh_obj.data.vertices:
-                v = vert.co
-                f.write(f"v {{v[0]:.6f}} {{v[1]:.6f}} {{v[2]:.6f}}\\n")
-            
-            # Calculate normals properly for Blender 4.4+
-            mesh_obj.data.calc_loop_triangles()
-            # Use calc_normals() instead of calc_normals_split() for Blender 4.4+
-            if hasattr(mesh_obj.data, 'calc_normals'):
-                mesh_obj.data.calc_normals()
-            
-            # Write normals for each polygon
-            written_normals = []
-            normal_index_map = {{}}
-            
-            for poly in mesh_obj.data.polygons:
-                normal = poly.normal
-                normal_key = (round(normal[0], 4), round(normal[1], 4), round(normal[2], 4))
-                
-                if normal_key not in normal_index_map:
-                    written_normals.append(normal)
-                    normal_index_map[normal_key] = len(written_normals)
-                    f.write(f"vn {{normal[0]:.4f}} {{normal[1]:.4f}} {{normal[2]:.4f}}\\n")
-            
-            # Write material usage
-            if mesh_obj.data.materials:
-                f.write(f"usemtl {{mesh_obj.data.materials[0].name}}\\n")
-            
-            # Write faces with proper indexing
-            logger.info(f"Writing {{len(mesh_obj.data.polygons)}} faces...")
-            
-            for poly_idx, poly in enumerate(mesh_obj.data.polygons):
-                if len(poly.vertices) >= 3:
-                    # Write smooth group
-                    f.write(f"s {{poly_idx + 1}}\\n")
-                    
-                    # Get normal index for this polygon
-                    normal = poly.normal
-                    normal_key = (round(normal[0], 4), round(normal[1], 4), round(normal[2], 4))
-                    normal_idx = normal_index_map[normal_key]
-                    
-                    # Write face with vertex and normal indices (OBJ uses 1-based indexing)
-                    face_line = "f"
-                    for vert_idx in poly.vertices:
-                        face_line += f" {{vert_idx + 1}}//{{normal_idx}}"
-                    face_line += "\\n"
-                    f.write(face_line)
-            
-            logger.info(f"Exported {{len(mesh_obj.data.vertices)}} vertices and {{len(mesh_obj.data.polygons)}} faces")
-        
-        logger.info(f"Manual OBJ export successful: {{filepath}}")
-        
-        # Create MTL file
-        mtl_path = filepath.replace('.obj', '.mtl')
-        with open(mtl_path, 'w') as f:
-            f.write("# Blender 4.4.3 MTL File\\n")
-            f.write("# www.blender.org\\n\\n")
-            
-            if mesh_obj.data.materials:
-                for mat in mesh_obj.data.materials:
-                    f.write(f"newmtl {{mat.name}}\\n")
-                    f.write("Ns 90.000000\\n")
-                    f.write("Ka 0.100000 0.100000 0.100000\\n")
-                    f.write("Ni 1.500000\\n")
-                    f.write("d 1.000000\\n")
-                    f.write("illum 3\\n")
-                    
-                    # Set diffuse color
-                    if hasattr(mat, 'diffuse_color'):
-                        color = mat.diffuse_color
-                        f.write(f"Kd {{color[0]:.6f}} {{color[1]:.6f}} {{color[2]:.6f}}\\n")
-                    else:
-                        f.write("Kd 0.800000 0.800000 0.800000\\n")
-                    
-                    f.write("Ks 0.500000 0.500000 0.500000\\n")
-                    f.write("Ke 0.000000 0.000000 0.000000\\n")
-                    f.write("\\n")
-            else:
-                # Create default material
-                f.write("newmtl DefaultMaterial\\n")
-                f.write("Ns 90.000000\\n")
-                f.write("Ka 0.100000 0.100000 0.100000\\n")
-                f.write("Kd 0.800000 0.800000 0.800000\\n")
-                f.write("Ks 0.500000 0.500000 0.500000\\n")
-                f.write("Ke 0.000000 0.000000 0.000000\\n")
-                f.write("Ni 1.500000\\n")
-                f.write("d 1.000000\\n")
-                f.write("illum 3\\n")
-        
-        logger.info(f"MTL file created: {{mtl_path}}")
-            
-    except Exception as e:
-        logger.error(f"Manual OBJ export failed: {{e}}")
-        import traceback
-        traceback.print_exc()
-        
-        # Try fallback using standard Blender export
-        logger.info("Attempting fallback export using standard Blender exporter...")
-        try:
-            # Select and make active
-            bpy.ops.object.select_all(action='DESELECT')
-            mesh_obj.select_set(True)
-            bpy.context.view_layer.objects.active = mesh_obj
-            
-            # Use Blender's built-in exporter as fallback
-            bpy.ops.wm.obj_export(
-                filepath=filepath,
-                export_selected_objects=True,
-                export_materials=True,
-                export_uv=True,
-                export_normals=True,
-                path_mode='COPY'
-            )
-            logger.info(f"Fallback OBJ export successful: {{filepath}}")
-        except Exception as fallback_error:
-            logger.error(f"Fallback export also failed: {{fallback_error}}")
-
-def main():
-    try:
-        args = parse_args()
-        logger.info(f"Update script args: {{args}}")
+        # Statements missing from the original block go right after newmtl
+        patched[1:1] = values.values()
+        return patched
+    
+    def _apply_update(self, original_obj_path: str, blender_updates: Dict[str, Any],
+                      output_path: Path) -> Tuple[bool, Optional[str], Optional[str]]:
+        """
+        Write the result of a normalized, non-empty update to output_path.
+        
+        Material-only and transform-only updates are applied in Python; anything else
+        runs the update script in a one-shot Blender process.
         
-        # Load update specification
-        with open(args.input, 'r') as f:
-            spec = json.load(f)
+        Returns:
+            Tuple of (success, output_path, error_message)
+        """
+        # Material-only edits only touch the MTL sidecar, so skip the Blender round-trip
+        if "material" in blender_updates and not any(key in blender_updates for key in self.TRANSFORM_KEYS):
+            return self._fast_material_update(original_obj_path, blender_updates["material"], output_path)
         
-        logger.info(f"Update specification: {{spec}}")
+        # Pure transforms are a vertex/normal rewrite of the OBJ text
+        if "material" not in blender_updates and any(key in blender_updates for key in self.TRANSFORM_KEYS):
+            return self._fast_obj_transform(original_obj_path, self._compose_transform(blender_updates), output_path)
         
-        # Import OBJ file
-        obj = load_obj(args.obj)
-        if not obj:
-            logger.error("Failed to load OBJ file")
-            sys.exit(1)
+        if self._executable_error:
+            return False, None, self._executable_error
         
-        # Apply updates
-        apply_updates(obj, spec)
+        # Ship the composed transform as 16 row-major floats instead of separate components
+        if any(key in blender_updates for key in self.TRANSFORM_KEYS):
+            blender_updates["transform_matrix"] = self._compose_transform(blender_updates).ravel().tolist()
+            for key in self.TRANSFORM_KEYS:
+                blender_updates.pop(key, None)
         
-        # Export updated OBJ
-        export_obj(args.output)
+        if self.debug:
+            print(f"Blender update spec: {blender_updates}")
         
-        logger.info("Update script completed successfully")
+        # Execute Blender command
+        cmd = [
+            self.blender_executable,
+            "--background",
+            "--python", str(UPDATE_SCRIPT),
+            "--", 
+            "--input", "-",  # The spec is small; it goes in on stdin instead of a temp file
+            "--obj", original_obj_path,
+            "--output", str(output_path),
+            "--log-level", self._log_level()
+        ]
         
-    except Exception as e:
-        logger.error(f"Update script failed: {{e}}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
-
-if __name__ == "__main__":
-    main()
-'''
+        if self.debug:
+            print(f"Executing Blender update command: {' '.join(cmd)}")
+        
+        try:
+            with self._one_shot_slots:
+                returncode, _, output_tail = self._run_streaming(cmd, _json_dumps(blender_updates))
+            
+            if returncode != 0:
+                return False, None, f"Blender update failed with code {returncode}: {output_tail or 'no output captured'}"
+            
+            # Check if output file was created
+            if output_path.exists():
+                if self.debug:
+                    print(f"✓ Output file created at: {output_path}")
+                    print(f"✓ Output file size: {output_path.stat().st_size} bytes")
+                    
+                    # Read and log a few lines of the created file for debugging
+                    try:
+                        with open(output_path, 'r') as f:
+                            lines = list(itertools.islice(f, 15))  # First 15 lines
+                        print("✓ Output file content preview:")
+                        for i, line in enumerate(lines):
+                            print(f"  {i+1}: {line.rstrip()}")
+                    except Exception as e:
+                        print(f"✗ Could not read output file: {e}")
+                
+                return True, str(output_path), None
+            else:
+                return False, None, "Output file was not created"
+                
+        except subprocess.TimeoutExpired:
+            return False, None, "Blender update timed out"
+        except Exception as e:
+            return False, None, f"Execution error: {str(e)}"
+    
+    def update_model(self, original_obj_path: str, updates: Dict[str, Any], output_name: Optional[str] = None,
+                     destination: Optional[str] = None) -> Tuple[bool, Optional[str], Optional[str]]:
+        """
+        Update an existing OBJ model with new transforms and material properties.
+        
+        Args:
+            original_obj_path: Path to the original .obj file
+            updates: Dictionary with update specifications
+            output_name: Optional name for output file
+            destination: Optional path the result is copied to (with its MTL and textures)
+                before returning. Without it the returned file belongs to the update cache
+                and is deleted once evicted, so callers keeping results should pass this.
+            
+        Returns:
+            Tuple of (success, output_path, error_message)
+        """
+        try:
+            # Validate original file exists
+            if not os.path.exists(original_obj_path):
+                return False, None, f"Original OBJ file not found: {original_obj_path}"
+            
+            # Generate output name if not provided
+            if not output_name:
+                original_name = Path(original_obj_path).stem
+                timestamp = secrets.token_hex(4)
+                output_name = f"{original_name}_edited_{timestamp}"
+            
+            # Prepare output directory
+            output_dir = self._output_dir
+            output_dir.mkdir(parents=True, exist_ok=True)
+            
+            # Convert updates dictionary to Blender-compatible format
+            blender_updates = self._build_blender_updates(updates, Path(original_obj_path).stem)
+            
+            # Identity transforms are dropped; an update left with nothing to apply returns the source as is
+            for key, identity in self.IDENTITY_TRANSFORM.items():
+                if blender_updates.get(key) == identity:
+                    del blender_updates[key]
+            if "material" not in blender_updates and not any(key in blender_updates for key in self.TRANSFORM_KEYS):
+                if destination:
+                    self._publish_update(original_obj_path, Path(destination))
+                    return True, str(destination), None
+                return True, original_obj_path, None
+            
+            # Re-sending an update already applied to an unchanged source reuses the previous output.
+            # The key is part of the output name, so a cached file is never rewritten by another update.
+            cache_key = self._update_cache_key(original_obj_path, blender_updates)
+            output_path = output_dir / f"{output_name}_{cache_key.hex()[:16]}.obj"
+            with self._update_cache_lock:
+                inflight = self._update_inflight.setdefault(cache_key, [threading.Lock(), 0])
+                inflight[1] += 1
+            try:
+                # Identical updates arriving together are computed once; the others then hit the cache
+                with inflight[0]:
+                    cached_path = self._cached_update(cache_key)
+                    if cached_path:
+                        if self.debug:
+                            print(f"Reusing cached update result: {cached_path}")
+                        result = (True, cached_path, None)
+                    else:
+                        result = self._remember_update(
+                            cache_key, self._apply_update(original_obj_path, blender_updates, output_path)
+                        )
+                    # Copied while the key is in flight, which keeps eviction from deleting it mid-copy
+                    if destination and result[0]:
+                        self._publish_update(result[1], Path(destination))
+                        return True, str(destination), None
+                    return result
+            finally:
+                with self._update_cache_lock:
+                    inflight[1] -= 1
+                    if not inflight[1]:
+                        del self._update_inflight[cache_key]
+                
+        except Exception as e:
+            import traceback
+            tb = traceback.format_exc()
+            return False, None, f"Error updating model: {str(e)}\n{tb}"
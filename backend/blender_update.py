@@ -0,0 +1,397 @@
+"""
+Entry point executed inside Blender to update an existing OBJ model.
+
+Usage:
+    blender --background --python blender_update.py -- --input <update_spec.json|-> --obj <model.obj> --output <updated.obj>
+"""
+
+import bpy
+import sys
+import json
+import os
+import io
+import argparse
+from pathlib import Path
+import logging
+import numpy as np
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Update object transforms & material")
+    parser.add_argument("--input", type=str, required=True, help="Path to JSON file with update spec, or - for stdin")
+    parser.add_argument("--obj", type=str, required=True, help="Path to OBJ file to update")
+    parser.add_argument("--output", type=str, required=True, help="Path to save updated OBJ")
+    parser.add_argument("--log-level", type=str, default="WARNING", help="Logging level name")
+    return parser.parse_args(sys.argv[sys.argv.index("--")+1:])
+
+
+args = parse_args()
+
+# Setup logging
+logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.WARNING),
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+logger.info("Starting Blender model update script")
+
+# Prefer orjson when Blender's Python has it, fall back to the standard library
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+def read_json(path):
+    raw = sys.stdin.buffer.read() if path == "-" else Path(path).read_bytes()
+    return _orjson.loads(raw) if _orjson else json.loads(raw)
+
+def load_obj(filepath):
+    """Import OBJ file using Blender 4.4+ API"""
+    logger.info(f"Importing OBJ: {filepath}")
+    # First clear any existing objects through the data API; bpy.ops rebuilds
+    # context and undo state on every call
+    for existing in list(bpy.data.objects):
+        bpy.data.objects.remove(existing, do_unlink=True)
+    for mesh in list(bpy.data.meshes):
+        bpy.data.meshes.remove(mesh)
+    for material in list(bpy.data.materials):
+        bpy.data.materials.remove(material)
+    
+    # Import OBJ file using new Blender 4.4+ operator
+    bpy.ops.wm.obj_import(filepath=filepath)
+    
+    # Return the imported object
+    if len(bpy.context.selected_objects) > 0:
+        obj = bpy.context.selected_objects[0]
+        logger.info(f"Imported object: {obj.name}")
+        
+        # Set object as active
+        bpy.context.view_layer.objects.active = obj
+        obj.select_set(True)
+        
+        # Log original vertex positions
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Original imported vertex positions:")
+            for i, vert in enumerate(obj.data.vertices[:8]):
+                logger.debug(f"  Original Vertex {i}: {vert.co[0]:.6f}, {vert.co[1]:.6f}, {vert.co[2]:.6f}")
+        
+        return obj
+    else:
+        logger.error("No objects were imported")
+        return None
+
+def principled_template_bsdf(node_tree):
+    """Return the BSDF of a tree holding only a Principled BSDF linked to a Material Output, else None"""
+    nodes = node_tree.nodes
+    if len(nodes) != 2 or len(node_tree.links) != 1:
+        return None
+    bsdf = next((node for node in nodes if node.type == 'BSDF_PRINCIPLED'), None)
+    output = next((node for node in nodes if node.type == 'OUTPUT_MATERIAL'), None)
+    return bsdf if bsdf is not None and output is not None else None
+
+def apply_updates(obj, spec):
+    """Apply updates to object using direct mesh vertex manipulation; returns True if geometry changed"""
+    logger.info(f"Applying updates to object: {obj.name}")
+    
+    # Make sure object is selected and active
+    bpy.context.view_layer.objects.active = obj
+    obj.select_set(True)
+    
+    # Reset object transforms to ensure clean state
+    obj.location = (0, 0, 0)
+    obj.rotation_euler = (0, 0, 0)
+    obj.scale = (1, 1, 1)
+    obj.rotation_mode = 'XYZ'
+    
+    # Apply transformations directly to mesh vertices
+    if "transform_matrix" in spec:
+        logger.info("Applying transformations directly to mesh vertices...")
+        
+        # Get mesh data
+        mesh = obj.data
+        
+        # The service composes translation @ rotation @ scale and sends it row-major
+        transform_matrix = np.asarray(spec["transform_matrix"], dtype=np.float64).reshape(4, 4)
+        logger.debug("Transform matrix:\n%s", transform_matrix)
+        
+        # Transform the whole vertex buffer in one numpy product; no bmesh copy of the mesh
+        coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", coords)
+        coords = coords.reshape(-1, 3) @ transform_matrix[:3, :3].T + transform_matrix[:3, 3]
+        mesh.vertices.foreach_set("co", coords.astype(np.float32).ravel())
+        mesh.update()
+    
+    # Handle material updates; an empty spec leaves the imported node tree untouched
+    if spec.get("material"):
+        logger.info("Applying material updates...")
+        
+        # Get or create material
+        if obj.data.materials:
+            mat = obj.data.materials[0]
+        else:
+            mat = bpy.data.materials.new(name=f"{obj.name}_material")
+            obj.data.materials.append(mat)
+        
+        # Enable nodes for material
+        mat.use_nodes = True
+        
+        # A plain BSDF -> Output tree (what the OBJ importer builds for untextured
+        # materials) is edited in place; anything else is rebuilt from scratch
+        bsdf = principled_template_bsdf(mat.node_tree)
+        if bsdf is None:
+            nodes = mat.node_tree.nodes
+            nodes.clear()
+            
+            # Create Principled BSDF
+            bsdf = nodes.new(type='ShaderNodeBsdfPrincipled')
+            
+            # Create Material Output
+            material_output = nodes.new(type='ShaderNodeOutputMaterial')
+            
+            # Link BSDF to output
+            mat.node_tree.links.new(bsdf.outputs['BSDF'], material_output.inputs['Surface'])
+        
+        material_spec = spec["material"]
+        
+        # Resolve each BSDF input once; the emission socket was renamed in Blender 4.0
+        inputs = bsdf.inputs
+        emission_input = inputs.get("Emission Color") or inputs.get("Emission")
+        material_inputs = (
+            ("color", inputs["Base Color"], lambda c: (c[0], c[1], c[2], c[3])),
+            ("roughness", inputs["Roughness"], float),
+            ("metallic", inputs["Metallic"], float),
+            ("emission", emission_input, lambda c: (c[0], c[1], c[2], 1.0)),
+            ("emissiveIntensity", inputs.get("Emission Strength"), float),
+        )
+        
+        for key, socket, convert in material_inputs:
+            if key in material_spec and socket is not None:
+                socket.default_value = convert(material_spec[key])
+                logger.info(f"Applied {key}: {material_spec[key]}")
+        
+        # Also set legacy diffuse color for OBJ export
+        if "color" in material_spec:
+            color = material_spec["color"]
+            mat.diffuse_color = (color[0], color[1], color[2], color[3])
+    
+    return "transform_matrix" in spec
+
+# MTL block written for each exported material: name and diffuse RGB
+MTL_TEMPLATE = (
+    "newmtl %s\n"
+    "Ns 90.000000\n"
+    "Ka 0.100000 0.100000 0.100000\n"
+    "Ni 1.500000\n"
+    "d 1.000000\n"
+    "illum 3\n"
+    "Kd %.6f %.6f %.6f\n"
+    "Ks 0.500000 0.500000 0.500000\n"
+    "Ke 0.000000 0.000000 0.000000\n"
+    "\n"
+)
+DEFAULT_DIFFUSE = (0.8, 0.8, 0.8)
+# Mesh.calc_normals() was removed in Blender 4.1; probe the type once instead of per export
+HAS_CALC_NORMALS = hasattr(bpy.types.Mesh, 'calc_normals')
+# Bias that makes quantized normal components (|q| <= 10000) non-negative 20-bit fields
+NORMAL_KEY_OFFSET = 0x80000
+DEFAULT_MTL = (
+    "newmtl DefaultMaterial\n"
+    "Ns 90.000000\n"
+    "Ka 0.100000 0.100000 0.100000\n"
+    "Kd 0.800000 0.800000 0.800000\n"
+    "Ks 0.500000 0.500000 0.500000\n"
+    "Ke 0.000000 0.000000 0.000000\n"
+    "Ni 1.500000\n"
+    "d 1.000000\n"
+    "illum 3\n"
+)
+
+def export_obj(filepath, mesh_obj=None, geom_dirty=True):
+    """Export the mesh to OBJ with Blender's native exporter, falling back to the manual writer"""
+    logger.info(f"Exporting to OBJ: {filepath}")
+    # Ensure output directory exists
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    
+    # Get the mesh object; callers that already hold it skip the scene scan
+    if mesh_obj is None:
+        mesh_obj = next((o for o in bpy.context.scene.objects if o.type == 'MESH'), None)
+    
+    if not mesh_obj:
+        logger.error("No mesh object found for export")
+        return
+    
+    # Log vertex positions before export
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Final vertex positions before export:")
+        for i, vert in enumerate(mesh_obj.data.vertices[:8]):
+            logger.debug(f"  Export Vertex {i}: {vert.co[0]:.6f}, {vert.co[1]:.6f}, {vert.co[2]:.6f}")
+    
+    try:
+        export_obj_native(filepath, mesh_obj)
+    except Exception as e:
+        logger.warning(f"Native OBJ export failed, falling back to manual writer: {e}")
+        export_obj_manual(filepath, mesh_obj, geom_dirty)
+
+def export_obj_native(filepath, mesh_obj):
+    """Export with the C++ bpy.ops.wm.obj_export operator"""
+    # Select and make active
+    bpy.ops.object.select_all(action='DESELECT')
+    mesh_obj.select_set(True)
+    bpy.context.view_layer.objects.active = mesh_obj
+    
+    # apply_updates resets the import axis rotation, so the mesh already holds the
+    # original OBJ coordinates; export them without another axis conversion
+    result = bpy.ops.wm.obj_export(
+        filepath=filepath,
+        export_selected_objects=True,
+        export_materials=True,
+        export_uv=True,
+        export_normals=True,
+        forward_axis='Y',
+        up_axis='Z',
+        path_mode='COPY'
+    )
+    if 'FINISHED' not in result:
+        raise RuntimeError(f"obj_export returned {result}")
+    logger.info(f"Native OBJ export successful: {filepath}")
+
+def export_obj_manual(filepath, mesh_obj, geom_dirty=True):
+    """Export mesh to OBJ using manual method for precise control"""
+    try:
+        # Accumulate the whole file in memory and write it with a single call
+        buf = io.StringIO()
+        # Write header
+        buf.write("# Blender 4.4.3\n")
+        buf.write("# www.blender.org\n")
+        mtl_name = os.path.basename(filepath).replace('.obj', '.mtl')
+        buf.write(f"mtllib {mtl_name}\n")
+        buf.write(f"o {mesh_obj.name}\n")
+        
+        # Write vertices using actual mesh coordinates, read in bulk instead of per-vertex RNA access
+        vertices = mesh_obj.data.vertices
+        co = np.empty(len(vertices) * 3, dtype=np.float32)
+        vertices.foreach_get("co", co)
+        np.savetxt(buf, co.reshape(-1, 3), fmt="v %.6f %.6f %.6f")
+        
+        # Recalculate normals only if the geometry was modified since import
+        # (loop triangles are not needed: faces are written per polygon)
+        if geom_dirty:
+            # Use calc_normals() instead of calc_normals_split() for Blender 4.4+
+            if HAS_CALC_NORMALS:
+                mesh_obj.data.calc_normals()
+        
+        # Write normals for each polygon
+        polygons = mesh_obj.data.polygons
+        poly_normals = np.empty(len(polygons) * 3, dtype=np.float32)
+        polygons.foreach_get("normal", poly_normals)
+        
+        # Deduplicate normals quantized to 4 decimals. Each component is offset into
+        # 20 unsigned bits and the three are packed into one int64 key, so np.unique
+        # sorts plain integers instead of comparing rows
+        quantized = np.rint(poly_normals.reshape(-1, 3) * 1e4).astype(np.int64) + NORMAL_KEY_OFFSET
+        keys = quantized[:, 0] | (quantized[:, 1] << 20) | (quantized[:, 2] << 40)
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        written_normals = np.stack([(unique_keys >> shift) & 0xFFFFF for shift in (0, 20, 40)], axis=1)
+        np.savetxt(buf, (written_normals - NORMAL_KEY_OFFSET) / 1e4, fmt="vn %.4f %.4f %.4f")
+        # OBJ normal indices are 1-based
+        poly_normal_idx = inverse.reshape(-1) + 1
+        
+        # Write material usage
+        if mesh_obj.data.materials:
+            buf.write(f"usemtl {mesh_obj.data.materials[0].name}\n")
+        
+        # Write faces with proper indexing
+        logger.info(f"Writing {len(polygons)} faces...")
+        
+        # Fetch polygon topology in bulk; loop_start/loop_total index into the flat loop vertex array
+        loop_start = np.empty(len(polygons), dtype=np.int32)
+        loop_total = np.empty(len(polygons), dtype=np.int32)
+        polygons.foreach_get("loop_start", loop_start)
+        polygons.foreach_get("loop_total", loop_total)
+        loop_vertices = np.empty(len(mesh_obj.data.loops), dtype=np.int32)
+        mesh_obj.data.loops.foreach_get("vertex_index", loop_vertices)
+        
+        # Faces carry per-polygon normals, so a single smoothing directive covers all of them
+        buf.write("s off\n")
+        
+        # Format polygons of equal size together (triangles, quads, ...) and keep the original order
+        face_lines = [""] * len(polygons)
+        for size in np.unique(loop_total).tolist():
+            if size < 3:
+                continue
+            poly_idx = np.flatnonzero(loop_total == size)
+            # Columns: vertex/normal index pairs (OBJ uses 1-based indexing)
+            columns = np.empty((len(poly_idx), 2 * size), dtype=np.int64)
+            columns[:, 0::2] = loop_vertices[loop_start[poly_idx, None] + np.arange(size)] + 1
+            columns[:, 1::2] = poly_normal_idx[poly_idx, None]
+            # Bound __mod__ of one format string, mapped in C over all rows of this size
+            format_line = ("f" + " %d//%d" * size + "\n").__mod__
+            for idx, line in zip(poly_idx.tolist(), map(format_line, map(tuple, columns.tolist()))):
+                face_lines[idx] = line
+        buf.write("".join(face_lines))
+        
+        logger.info(f"Exported {len(vertices)} vertices and {len(polygons)} faces")
+        
+        # Binary mode: one encode of the whole body and no newline translation
+        with open(filepath, 'wb') as f:
+            f.write(buf.getvalue().encode('utf-8'))
+        
+        logger.info(f"Manual OBJ export successful: {filepath}")
+        
+        # Create MTL file
+        mtl_path = filepath.replace('.obj', '.mtl')
+        buf = io.StringIO()
+        buf.write("# Blender 4.4.3 MTL File\n")
+        buf.write("# www.blender.org\n\n")
+        
+        if mesh_obj.data.materials:
+            # One template per material, using the diffuse color when the material has one
+            buf.write("".join(
+                MTL_TEMPLATE % (mat.name, *(mat.diffuse_color[:3] if hasattr(mat, 'diffuse_color') else DEFAULT_DIFFUSE))
+                for mat in mesh_obj.data.materials
+            ))
+        else:
+            # Create default material
+            buf.write(DEFAULT_MTL)
+        
+        with open(mtl_path, 'wb') as f:
+            f.write(buf.getvalue().encode('utf-8'))
+        
+        logger.info(f"MTL file created: {mtl_path}")
+            
+    except Exception as e:
+        logger.error(f"Manual OBJ export failed: {e}")
+        import traceback
+        traceback.print_exc()
+
+def main():
+    try:
+        logger.info(f"Update script args: {args}")
+        
+        # Load update specification
+        spec = read_json(args.input)
+        
+        logger.debug("Update specification: %s", spec)
+        
+        # Import OBJ file
+        obj = load_obj(args.obj)
+        if not obj:
+            logger.error("Failed to load OBJ file")
+            sys.exit(1)
+        
+        # Apply updates
+        geom_dirty = apply_updates(obj, spec)
+        
+        # Export updated OBJ
+        export_obj(args.output, obj if obj.type == 'MESH' else None, geom_dirty)
+        
+        logger.info("Update script completed successfully")
+        
+    except Exception as e:
+        logger.error(f"Update script failed: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
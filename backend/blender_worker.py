@@ -0,0 +1,198 @@
+"""
+Entry point executed inside Blender to run a drawing session.
+
+Usage:
+    blender --background --python blender_worker.py -- --session <session.json> --result <result.json>
+    blender --background --python blender_worker.py -- --serve
+
+With --serve the script stays alive and handles one JSON-encoded session per stdin
+line, answering each with a RESULT_SENTINEL-prefixed JSON line on stdout.
+"""
+
+import sys
+import json
+import os
+import argparse
+from pathlib import Path
+import traceback
+import logging
+
+
+def parse_args():
+    """Parse command line arguments passed after the "--" separator"""
+    parser = argparse.ArgumentParser(description="Execute a Blender drawing session")
+    parser.add_argument("--session", type=str, help="Path to JSON file with session data")
+    parser.add_argument("--result", type=str, help="Path to write the JSON result to")
+    parser.add_argument("--serve", action="store_true", help="Handle sessions from stdin until it is closed")
+    parser.add_argument("--log-level", type=str, default="WARNING", help="Logging level name")
+    parser.add_argument("--backend-dir", type=str, help="Directory containing the blender_draw package")
+    parsed = parser.parse_args(sys.argv[sys.argv.index("--")+1:])
+    if not parsed.serve and not (parsed.session and parsed.result):
+        parser.error("--session and --result are required unless --serve is given")
+    return parsed
+
+
+# Marks result lines on stdout; anything else there is Blender or drawing-code output
+RESULT_SENTINEL = b"@@BLENDER_RESULT@@"
+
+
+args = parse_args()
+
+logging.basicConfig(level=getattr(logging, args.log_level.upper(), logging.WARNING),
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+logger.info("Starting Blender execution script")
+
+# Prefer orjson when Blender's Python has it, fall back to the standard library
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+def read_json(path):
+    raw = Path(path).read_bytes()
+    return _orjson.loads(raw) if _orjson else json.loads(raw)
+
+def dumps_json(data):
+    return _orjson.dumps(data) if _orjson else json.dumps(data).encode("utf-8")
+
+def write_json(path, data):
+    Path(path).write_bytes(dumps_json(data))
+
+def find_backend_dir():
+    """Locate the directory containing the blender_draw module when the service did not pass it"""
+    backend_candidates = [
+        Path(__file__).resolve().parent,
+        Path(os.getcwd()),
+        Path(os.getcwd()) / "backend"
+    ]
+    for candidate in backend_candidates:
+        logger.debug(f"Checking backend candidate: {candidate}")
+        if (candidate / "blender_draw").exists():
+            logger.info(f"Found backend directory: {candidate}")
+            return candidate
+    
+    error_msg = f"Could not find blender_draw module in candidates: {[str(c) for c in backend_candidates]}"
+    logger.error(error_msg)
+    raise ImportError(error_msg)
+
+
+# The service passes the backend directory it already knows; searching is only for manual runs
+backend_dir = Path(args.backend_dir) if args.backend_dir else find_backend_dir()
+
+sys.path.insert(0, str(backend_dir))
+logger.info(f"Added to Python path: {str(backend_dir)}")
+# Drawings are exported relative to the backend directory; the service does not set a cwd
+os.chdir(backend_dir)
+
+
+# Drawing entry point, imported once by load_drawing_code() and reused by every session
+execute_drawing_session = None
+
+
+def load_drawing_code():
+    """Import blender_draw.draw_models on first use and return its session entry point"""
+    global execute_drawing_session
+    if execute_drawing_session is None:
+        logger.info("Importing blender_draw.draw_models")
+        from blender_draw.draw_models import execute_drawing_session as entry_point
+        execute_drawing_session = entry_point
+    return execute_drawing_session
+
+
+def run_session(session_data):
+    """Run one drawing session and build the result dictionary sent back to the service"""
+    try:
+        run_drawing_session = load_drawing_code()
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Session data loaded: {json.dumps(session_data, indent=2)}")
+        
+        logger.info("Executing drawing session...")
+        session_id, output_path = run_drawing_session(session_data)
+        logger.info(f"Drawing session completed: session_id={session_id}, output_path={output_path}")
+        
+        # Verify output file exists
+        if output_path and os.path.exists(output_path):
+            file_size = os.path.getsize(output_path)
+            logger.info(f"Output file exists with size: {file_size} bytes")
+            
+            # Read and log file content preview for debugging
+            if file_size < 1000 and logger.isEnabledFor(logging.INFO):  # Only for small files
+                try:
+                    with open(output_path, 'r') as f:
+                        content = f.read()
+                    logger.info(f"File content preview:\n{content[:500]}")
+                except Exception as e:
+                    logger.warning(f"Could not read file content: {e}")
+        else:
+            logger.error(f"Output file does not exist: {output_path}")
+        
+        result = {
+            "success": True,
+            "session_id": session_id,
+            "output_path": str(output_path),
+            "error": None
+        }
+    
+    except Exception as e:
+        error_msg = str(e)
+        tb = traceback.format_exc()
+        logger.error(f"Exception occurred: {error_msg}")
+        logger.error(f"Traceback:\n{tb}")
+        
+        result = {
+            "success": False,
+            "session_id": None,
+            "output_path": None,
+            "error": error_msg,
+            "traceback": tb
+        }
+    
+    return result
+
+
+def serve():
+    """Handle sessions from stdin, one JSON document per line, until stdin is closed"""
+    logger.info("Serving drawing sessions from stdin")
+    try:
+        # Load the drawing code before the first session arrives; a failure is reported per session
+        load_drawing_code()
+    except Exception as e:
+        logger.error(f"Could not preload blender_draw.draw_models: {e}")
+    for line in sys.stdin.buffer:
+        if not line.strip():
+            continue
+        try:
+            session_data = _orjson.loads(line) if _orjson else json.loads(line)
+        except ValueError as e:
+            result = {"success": False, "session_id": None, "output_path": None, "error": f"Invalid session JSON: {e}"}
+        else:
+            result = run_session(session_data)
+        
+        # Flush any text the drawing code printed so it cannot split the result line, and start
+        # the result on a fresh line in case that text (or Blender's own output) ended mid-line
+        sys.stdout.flush()
+        sys.stdout.buffer.write(b"\n" + RESULT_SENTINEL + b" " + dumps_json(result) + b"\n")
+        sys.stdout.buffer.flush()
+    logger.info("stdin closed, worker exiting")
+
+
+if args.serve:
+    serve()
+else:
+    logger.info(f"Reading session data from: {args.session}")
+    try:
+        session_data = read_json(args.session)
+    except Exception as e:
+        session_data = None
+        result = {"success": False, "session_id": None, "output_path": None,
+                  "error": f"Could not read session data: {e}", "traceback": traceback.format_exc()}
+    if session_data is not None:
+        result = run_session(session_data)
+    
+    logger.info(f"Writing result to: {args.result}")
+    write_json(args.result, result)
+    
+    logger.info("Blender execution script completed")
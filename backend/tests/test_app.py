@@ -0,0 +1,107 @@
+import base64
+import time
+
+import pytest
+
+pytest.importorskip("flask")
+
+import app as backend_app
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Test client whose models folder and database live in tmp_path"""
+    models_dir = tmp_path / "models"
+    models_dir.mkdir()
+    monkeypatch.setattr(backend_app, "MODELS_FOLDER", models_dir)
+    monkeypatch.setattr(backend_app, "MODELS_FOLDER_STR", str(models_dir))
+    monkeypatch.setattr(backend_app, "MODELS_DB_FILE", models_dir / "models_db.json")
+    monkeypatch.setattr(backend_app, "models", [])
+    yield backend_app.app.test_client()
+    backend_app.flush_models_save()
+
+
+def test_custom_coords_registers_model(client, tmp_path, monkeypatch):
+    sessions = []
+
+    def fake_session(session_data):
+        sessions.append(session_data)
+        output_path = tmp_path / f"{session_data['output_name']}.obj"
+        output_path.write_text("o Mesh\n" + "v 0 0 0\n" * 40)
+        return True, str(output_path), None
+
+    monkeypatch.setattr(backend_app.blender_service, "execute_drawing_session", fake_session)
+
+    response = client.post("/api/draw/custom-coords", json={
+        "coordinates_text": "0 0 0\n1 0 0\n0 1 0\n0 0 1",
+        "name": "Tetra",
+        "use_convex_hull": True
+    })
+
+    assert response.status_code == 201, response.get_json()
+    model = response.get_json()["model"]
+    assert model["description"] == "Custom mesh from coordinates (4 vertices, convex_hull=True)"
+    assert model["modelUrl"] == "/models/custom_mesh_tetra.obj"
+    assert (tmp_path / "models" / "custom_mesh_tetra.obj").exists()
+    assert backend_app.models == [model]
+
+    (command, params), = sessions[0]["commands"]
+    assert command == "custom_coords"
+    assert len(base64.b64decode(params["points_f64"])) == 4 * 3 * 8
+
+
+def test_custom_coords_rejects_invalid_text(client):
+    response = client.post("/api/draw/custom-coords", json={"coordinates_text": "1 2\nfoo"})
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "At least 3 coordinate points are required, got 2"
+
+
+def test_edited_models_with_the_same_name_stay_independent(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(backend_app.blender_service, "_output_dir", tmp_path / "drawings")
+    models_dir = tmp_path / "models"
+    for model_id, vertex in (("a", "1 1 1"), ("b", "3 1 1")):
+        (models_dir / f"{model_id}.obj").write_text(f"o Box\nv {vertex}\n")
+        backend_app.models.append({"id": model_id, "name": "Box", "modelUrl": f"/models/{model_id}.obj"})
+
+    assert client.post("/api/models/a/update", json={"scale": [2, 2, 2]}).status_code == 200
+    published = (models_dir / "a_edited.obj").read_text()
+    assert "v 2.000000 2.000000 2.000000" in published
+
+    assert client.post("/api/models/b/update", json={"scale": [2, 1, 1]}).status_code == 200
+    assert (models_dir / "a_edited.obj").read_text() == published
+    assert "v 6.000000 1.000000 1.000000" in (models_dir / "b_edited.obj").read_text()
+
+
+def wait_for_job(job_id):
+    job = backend_app.draw_jobs[job_id]
+    job.result(timeout=5)
+    for _ in range(100):
+        with backend_app.draw_jobs_lock:
+            if job_id in backend_app.draw_jobs_finished:
+                return
+        time.sleep(0.01)
+
+
+def test_drawing_job_result_is_collected_once(client, monkeypatch):
+    monkeypatch.setattr(backend_app, "run_drawing_job", lambda session_data: {"id": "model"})
+
+    job_id = client.post("/api/draw/jobs", json={"commands": []}).get_json()["job_id"]
+    wait_for_job(job_id)
+
+    assert client.get(f"/api/draw/jobs/{job_id}").get_json() == {
+        "job_id": job_id, "status": "done", "model": {"id": "model"}
+    }
+    assert client.get(f"/api/draw/jobs/{job_id}").status_code == 404
+    assert job_id not in backend_app.draw_jobs_finished
+
+
+def test_uncollected_drawing_jobs_expire(client, monkeypatch):
+    monkeypatch.setattr(backend_app, "run_drawing_job", lambda session_data: {"id": "model"})
+    monkeypatch.setattr(backend_app.Config, "DRAW_JOB_TTL", 0)
+
+    job_id = client.post("/api/draw/jobs", json={"commands": []}).get_json()["job_id"]
+    wait_for_job(job_id)
+    client.post("/api/draw/jobs", json={"commands": []})
+
+    assert job_id not in backend_app.draw_jobs
+    assert job_id not in backend_app.draw_jobs_finished
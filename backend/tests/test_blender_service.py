@@ -0,0 +1,221 @@
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from blender_service import BlenderDrawingService
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = BlenderDrawingService("blender-not-installed", persistent_worker=False)
+    service._output_dir = tmp_path / "drawings"
+    return service
+
+
+@pytest.fixture
+def box(tmp_path):
+    obj_path = tmp_path / "box.obj"
+    obj_path.write_text("o Box\nv 1 1 1\nvn 0 0 1\nf 1 1 1\n")
+    return str(obj_path)
+
+
+def vertices(obj_path):
+    return [line.split()[1:] for line in Path(obj_path).read_text().splitlines() if line.startswith("v ")]
+
+
+def test_cached_update_is_not_overwritten_by_later_updates(service, box):
+    results = [service.update_model(box, {"scale": [s, s, s]}, "box_edited") for s in (2, 3, 2)]
+
+    assert all(success for success, _, _ in results)
+    assert vertices(results[0][1]) == [["2.000000", "2.000000", "2.000000"]]
+    assert vertices(results[1][1]) == [["3.000000", "3.000000", "3.000000"]]
+    assert results[2][1] == results[0][1]
+    assert vertices(results[2][1]) == [["2.000000", "2.000000", "2.000000"]]
+
+
+def test_evicted_update_outputs_are_removed(service, box):
+    service.UPDATE_CACHE_SIZE = 1
+    _, first, _ = service.update_model(box, {"scale": [2, 2, 2]}, "box_edited")
+    _, second, _ = service.update_model(box, {"scale": [3, 3, 3]}, "box_edited")
+
+    assert not Path(first).exists()
+    assert Path(second).exists()
+
+
+def test_zero_scale_transform_flattens_without_blender(service, box):
+    success, output_path, error = service.update_model(box, {"scale": [0, 1, 1]}, "box_flat")
+
+    assert success, error
+    lines = Path(output_path).read_text().splitlines()
+    assert "v 0.000000 1.000000 1.000000" in lines
+    # The +Z normal lies in the flattened plane, so it collapses to zero instead of failing
+    assert "vn 0.0000 0.0000 0.0000" in lines
+
+
+@pytest.fixture
+def hanging_service(tmp_path):
+    """Service whose single worker reads a session and then never answers"""
+    if os.name == "nt":
+        pytest.skip("uses an executable script as the Blender stand-in")
+    hanging_blender = tmp_path / "blender"
+    hanging_blender.write_text(f"#!{sys.executable}\nimport sys, time\nsys.stdin.readline()\ntime.sleep(60)\n")
+    hanging_blender.chmod(0o755)
+    service = BlenderDrawingService(str(hanging_blender))
+    for worker in service._workers:
+        worker.timeout = 0.5
+    yield service
+    for worker in service._workers:
+        worker._kill()
+
+
+def test_hung_worker_session_is_not_rerun(hanging_service):
+    started = time.monotonic()
+    result = hanging_service.execute_drawing_session({"commands": []})
+
+    assert result == (False, None, "Blender execution timed out")
+    assert time.monotonic() - started < 5
+
+
+def test_timeout_is_reported_when_the_worker_cannot_restart(hanging_service, monkeypatch):
+    worker, = hanging_service._workers
+    # The worker is already running; only the restart after the timeout fails
+
+    def fail_start():
+        raise OSError("spawn failed")
+
+    monkeypatch.setattr(worker, "_start", fail_start)
+    started = time.monotonic()
+    result = hanging_service.execute_drawing_session({"commands": []})
+
+    assert result == (False, None, "Blender execution timed out")
+    assert time.monotonic() - started < 5
+
+
+def test_close_does_not_wait_for_a_running_session(hanging_service):
+    worker, = hanging_service._workers
+    session = threading.Thread(target=hanging_service.execute_drawing_session, args=({"commands": []},))
+    worker.timeout = 30
+    session.start()
+    time.sleep(0.2)
+
+    started = time.monotonic()
+    worker.close()
+    session.join(timeout=5)
+
+    assert time.monotonic() - started < 5
+    assert not session.is_alive()
+
+
+
+@pytest.mark.skipif(os.name == "nt", reason="uses an executable script as the Blender stand-in")
+def test_worker_result_follows_unterminated_output(tmp_path):
+    # Stand-in drawing code that leaves a partial line on fd 1 before the worker answers
+    draw_dir = tmp_path / "backend" / "blender_draw"
+    draw_dir.mkdir(parents=True)
+    (draw_dir / "__init__.py").write_text("")
+    (draw_dir / "draw_models.py").write_text(
+        "import os\n"
+        "def execute_drawing_session(session_data):\n"
+        "    os.write(1, b'progress without newline')\n"
+        "    with open('out.obj', 'w') as f:\n"
+        "        f.write('o Empty\\n')\n"
+        "    return session_data['session_id'], os.path.abspath('out.obj')\n"
+    )
+    # Stand-in Blender that runs the real worker script against that drawing code
+    fake_blender = tmp_path / "blender"
+    fake_blender.write_text(
+        f"#!{sys.executable}\n"
+        "import runpy, sys\n"
+        f"sys.argv[sys.argv.index('--backend-dir') + 1] = {str(tmp_path / 'backend')!r}\n"
+        "runpy.run_path(sys.argv[sys.argv.index('--python') + 1], run_name='__main__')\n"
+    )
+    fake_blender.chmod(0o755)
+    service = BlenderDrawingService(str(fake_blender))
+    for worker in service._workers:
+        worker.timeout = 10
+
+    try:
+        success, output_path, error = service.execute_drawing_session({"commands": []})
+    finally:
+        for worker in service._workers:
+            worker._kill()
+
+    assert success, error
+    assert output_path == str(tmp_path / "backend" / "out.obj")
+
+
+def test_hex_colors_parse_with_optional_alpha():
+    assert BlenderDrawingService._convert_hex_to_rgba("#ff0000") == (1.0, 0.0, 0.0, 1.0)
+    assert BlenderDrawingService._convert_hex_to_rgba("00ff0080") == (0.0, 1.0, 0.0, 128 / 255.0)
+
+
+@pytest.mark.parametrize("color", ["#fff", "#ffff", "#fffffff", "#ff_fff", "#-fffff", "#gggggg"])
+def test_malformed_hex_colors_are_rejected(color):
+    with pytest.raises(ValueError):
+        BlenderDrawingService._convert_hex_to_rgba(color)
+
+
+def test_coordinates_parse_from_text_or_point_list():
+    text_coords, error = BlenderDrawingService.parse_coordinates("0 0 0\n1 0 0\n0 1 0")
+    assert error is None
+    list_coords, error = BlenderDrawingService.parse_coordinates([{"x": 0, "y": 0, "z": 0}, {"x": 1}, {"y": 1}])
+    assert error is None
+    assert (list_coords == text_coords).all()
+
+
+def test_invalid_coordinates_are_described():
+    assert BlenderDrawingService.parse_coordinates("0 0 0\n1 0\n0 1 0") == \
+        (None, "Invalid coordinate format at line 2: '1 0'. Expected 'X Y Z'")
+    assert BlenderDrawingService.parse_coordinates([{"x": 0}, {"x": 1}]) == \
+        (None, "At least 3 coordinate points are required, got 2")
+    assert BlenderDrawingService.parse_coordinates([{"x": "a"}, {}, {}]) == (None, "Invalid coordinates format")
+
+
+def test_update_cache_tells_materials_apart(service, tmp_path):
+    results = []
+    for name, color in (("red", "1 0 0"), ("blue", "0 0 1")):
+        model_dir = tmp_path / name
+        model_dir.mkdir()
+        (model_dir / "box.obj").write_text("mtllib box.mtl\no Box\nv 1 1 1\nusemtl Mat\nf 1 1 1\n")
+        (model_dir / "box.mtl").write_text(f"newmtl Mat\nKd {color}\n")
+        results.append(service.update_model(str(model_dir / "box.obj"), {"scale": [2, 2, 2]}, "box_edited"))
+
+    (_, red, _), (_, blue, _) = results
+    assert red != blue
+    assert "Kd 0 0 1" in Path(blue).with_suffix(".mtl").read_text()
+
+
+def test_update_results_in_use_are_not_evicted(service, box, tmp_path, monkeypatch):
+    service.UPDATE_CACHE_SIZE = 1
+    _, first, _ = service.update_model(box, {"scale": [2, 2, 2]}, "box_edited")
+    first_key = next(iter(service._update_cache))
+    # An update still publishing its result holds the key in flight
+    service._update_inflight[first_key] = [None, 1]
+    service.update_model(box, {"scale": [3, 3, 3]}, "box_edited")
+    assert Path(first).exists()
+
+    del service._update_inflight[first_key]
+    service.update_model(box, {"scale": [4, 4, 4]}, "box_edited")
+    assert not Path(first).exists()
+
+
+def test_update_is_published_to_destination(service, tmp_path):
+    model_dir = tmp_path / "model"
+    model_dir.mkdir()
+    (model_dir / "box.obj").write_text("mtllib box.mtl\no Box\nv 1 1 1\n")
+    (model_dir / "box.mtl").write_text("newmtl Mat\nKd 1 1 1\n")
+    destination = tmp_path / "published" / "box_edited.obj"
+    destination.parent.mkdir()
+
+    success, output_path, error = service.update_model(
+        str(model_dir / "box.obj"), {"scale": [2, 2, 2]}, "box_edited", destination=str(destination)
+    )
+
+    assert success, error
+    assert output_path == str(destination)
+    assert vertices(destination) == [["2.000000", "2.000000", "2.000000"]]
+    assert destination.with_suffix(".mtl").read_text() == "newmtl Mat\nKd 1 1 1\n"